@@ -0,0 +1,32 @@
+# Generated by Django 5.2.7 on 2026-10-18 15:45
+
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce
+
+
+def backfill_upvotes_count(apps, schema_editor):
+    Answer = apps.get_model('answers', 'Answer')
+    through = Answer.upvotes.through
+
+    totals = through.objects.filter(
+        answer_id=OuterRef('pk')
+    ).values('answer_id').annotate(total=Count('pk')).values('total')
+
+    Answer.objects.update(upvotes_count=Coalesce(Subquery(totals, output_field=models.IntegerField()), Value(0)))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('answers', '0003_alter_answer_upvotes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='answer',
+            name='upvotes_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(backfill_upvotes_count, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,36 @@
+# Generated by Django 5.2.7 on 2026-10-18 16:23
+
+from django.db import migrations, models
+from django.db.models import OuterRef, Subquery
+
+
+def keep_one_accepted_answer_per_question(apps, schema_editor):
+    # Until now only a check in the serializer, which races, kept a second
+    # answer from being accepted. The oldest accepted answer of each question
+    # stays accepted; points already awarded for the others are kept.
+    Answer = apps.get_model('answers', 'Answer')
+
+    first_accepted = Answer.objects.filter(
+        question=OuterRef('question'), is_accepted=True
+    ).order_by('pk').values('pk')[:1]
+
+    Answer.objects.filter(is_accepted=True).exclude(pk=Subquery(first_accepted)).update(is_accepted=False)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('answers', '0005_answer_question_created_idx'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='answer',
+            index=models.Index(condition=models.Q(('is_accepted', True)), fields=['author'], name='answer_accepted_author_idx'),
+        ),
+        migrations.RunPython(keep_one_accepted_answer_per_question, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='answer',
+            constraint=models.UniqueConstraint(condition=models.Q(('is_accepted', True)), fields=('question',), name='unique_accepted_answer_per_question'),
+        ),
+    ]
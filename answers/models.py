@@ -1,17 +1,29 @@
 from django.db import models
+from app.tracking import FieldTrackerMixin
 from profiles.models import UserProfile
 from questions.models import Question
 
 
-class Answer(models.Model):
+class Answer(FieldTrackerMixin, models.Model):
+    tracked_fields = ('is_accepted',)
+
     content = models.TextField(help_text='Uma resposta também pode inserir markdown')
     is_accepted = models.BooleanField(default=False)
     created_at = models.DateTimeField(auto_now_add=True)
     author = models.ForeignKey(UserProfile, on_delete=models.CASCADE, related_name='answer_author')
     question = models.ForeignKey(Question, on_delete=models.CASCADE, related_name='answers')
     upvotes = models.ManyToManyField(UserProfile, related_name='upvote')
+    upvotes_count = models.PositiveIntegerField(default=0, editable=False)
 
     class Meta:
+        indexes = [
+            models.Index(fields=['question', 'created_at', 'id'], name='answer_question_created_idx'),
+            models.Index(
+                fields=['author'],
+                name='answer_accepted_author_idx',
+                condition=models.Q(is_accepted=True)
+            ),
+        ]
         constraints = [
             models.UniqueConstraint(
                 fields=['question'],
@@ -1,5 +1,4 @@
 from rest_framework import serializers
-from drf_spectacular.utils import extend_schema_field
 from app.exceptions import AnswerAlreadyAccepted
 from answers.models import Answer
 
@@ -19,7 +18,7 @@ class AnswerModelSerializer(serializers.ModelSerializer):
 
 
 class AnswerDetailModelSerializer(serializers.ModelSerializer):
-    quantity_upvotes = serializers.SerializerMethodField()
+    quantity_upvotes = serializers.IntegerField(source='upvotes_count', read_only=True)
     profile_name1 = serializers.CharField(source='author.user.first_name')
     profile_name2 = serializers.CharField(source='author.user.last_name')
 
@@ -28,10 +27,6 @@ class AnswerDetailModelSerializer(serializers.ModelSerializer):
         fields = ['profile_name1', 'profile_name2', 'content', 'is_accepted',
                   'created_at', 'question', 'quantity_upvotes']
 
-    @extend_schema_field(serializers.IntegerField())
-    def get_quantity_upvotes(self, obj):
-        return obj.upvotes.count()
-
 
 class AnswerUpdateModelSerializer(serializers.ModelSerializer):
 
@@ -1,72 +1,83 @@
 from django.dispatch import receiver
-from django.core.cache import caches
 from django.core.exceptions import ObjectDoesNotExist
-from django.db.models.signals import pre_save, post_save, post_delete
+from django.db.models.signals import pre_save, post_save, post_delete, m2m_changed
 from answers.models import Answer
 from questions.models import Question
+from profiles import reputation
+from profiles.models import ReputationEvent
+from profiles.tasks import award_reputation, adjust_stats
+from app.cache import bump_namespace
+from app.counters import M2MCounter
 
 
-cache_view = caches['view_cache']
+upvotes_counter = M2MCounter(Answer.upvotes, 'upvotes_count')
 
 
 @receiver(pre_save, sender=Answer)
 def verify_answer_has_solution_accepted(sender, instance, **kwargs):
-    if instance.pk is None:
-        return
-
-    answer = Answer.objects.get(pk=instance.pk)
+    changed = instance.has_changed('is_accepted')
 
-    if instance.is_accepted and not answer.is_accepted:
-        instance._answer_change_to_accepted = True
-    if not instance.is_accepted and answer.is_accepted:
-        instance._answer_want_be_revoked = True
+    instance._answer_change_to_accepted = changed and instance.is_accepted
+    instance._answer_want_be_revoked = changed and not instance.is_accepted
 
 
 @receiver(post_save, sender=Answer)
 def created_answer(sender, instance, created, **kwargs):
     was_changed_to_accepted = getattr(instance, '_answer_change_to_accepted', False)
     want_be_revoked = getattr(instance, '_answer_want_be_revoked', False)
-    clear_question_cache(instance.question.pk)
+    clear_question_cache(instance.question_id)
 
     if created:
+        if instance.is_accepted:
+            adjust_stats.delay(instance.author_id, 'answers_accepted', 1)
         return
 
     if was_changed_to_accepted:
         alter_is_solutioned(instance, True)
-        get_profile = instance.author
-        get_profile.reputation_score += 20
-        get_profile.save(update_fields=['reputation_score'])
+        award_reputation.delay(instance.author_id, 20, ReputationEvent.Reason.ANSWER_ACCEPTED)
+        adjust_stats.delay(instance.author_id, 'answers_accepted', 1)
     elif want_be_revoked:
-        return
+        adjust_stats.delay(instance.author_id, 'answers_accepted', -1)
 
 
 @receiver(post_delete, sender=Answer)
-def decrease_reputation_score(sender, instance, **kwargs):
+def decrease_reputation_score(sender, instance, origin=None, **kwargs):
     if instance.is_accepted:
-        author = instance.author
         try:
             alter_is_solutioned(instance, False)
         except ObjectDoesNotExist:
             pass
 
-        new_score = author.reputation_score - 20
-        author.reputation_score = max(0, new_score)
-        author.save(update_fields=['reputation_score'])
+        if not reputation.deleted_with_profile(origin):
+            award_reputation.delay(instance.author_id, -20, ReputationEvent.Reason.ANSWER_REMOVED)
+
+        # Also needed when the cascade starts at another profile's question.
+        adjust_stats.delay(instance.author_id, 'answers_accepted', -1)
 
     if instance.question_id:
         clear_question_cache(instance.question_id)
 
 
+@receiver(m2m_changed, sender=Answer.upvotes.through)
+def update_upvotes_count(sender, instance, action, reverse, pk_set, **kwargs):
+    upvotes_counter.handle(instance, action, reverse, pk_set)
+
+    if action not in ('post_add', 'post_remove', 'post_clear'):
+        return
+
+    if reverse:
+        question_pks = Answer.objects.filter(pk__in=pk_set or []).values_list('question_id', flat=True)
+    else:
+        question_pks = [instance.question_id]
+
+    bump_namespace(*[f"question_{pk}" for pk in set(question_pks)])
+
+
 def alter_is_solutioned(answer: Answer, state: bool):
     question = answer.question
     Question.objects.filter(pk=question.pk).update(is_solutioned=state)
+    bump_namespace("list_all_question_published", f"profile_{answer.author_id}")
 
 
 def clear_question_cache(question_pk):
-    key = f"question_detail_{question_pk}"
-    cache_view.delete(key)
-
-    key_list = f"answers_question_list_{question_pk}"
-    cache_view.delete(key_list)
-
-    cache_view.delete("list_all_question_published")
+    bump_namespace(f"question_{question_pk}")
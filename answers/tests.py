@@ -165,3 +165,72 @@ class AnswerAPITestCase(APITestCase):
         self.question1.refresh_from_db()
 
         self.assertTrue(self.question1.is_solutioned)
+
+    def test_new_answer_invalidates_cached_question_detail(self):
+        url_question = reverse('detail-question', kwargs={'pk': self.question1.pk})
+
+        response = self.client.get(url_question)
+        self.assertEqual(len(response.json()['answers']), 1)
+
+        self.client.force_authenticate(user=self.profile2.user)
+        data = {"content": "Outra forma de resolver", "question": self.question1.pk}
+        self.client.post(self.url_post, data, format='json')
+
+        response = self.client.get(url_question)
+        self.assertEqual(len(response.json()['answers']), 2)
+
+    def test_accepting_answer_invalidates_cached_question_list(self):
+        url_list = reverse('create-question')
+
+        response = self.client.get(url_list)
+        question = next(item for item in response.json()['results'] if item['pk'] == self.question1.pk)
+        self.assertFalse(question['is_solutioned'])
+
+        self.client.force_authenticate(user=self.profile1.user)
+        self.client.patch(self.url_answer_accepted, {"is_accepted": True}, format='json')
+
+        response = self.client.get(url_list)
+        question = next(item for item in response.json()['results'] if item['pk'] == self.question1.pk)
+        self.assertTrue(question['is_solutioned'])
+
+    def test_saving_answer_does_not_reload_it_to_detect_acceptance(self):
+        answer = Answer.objects.get(pk=self.answer1.pk)
+        answer.content = 'Resposta editada'
+
+        with self.assertNumQueries(1):
+            answer.save(update_fields=['content'])
+
+        answer.is_accepted = True
+        answer.save()
+        answer.save()
+
+        self.profile2.refresh_from_db()
+        self.question1.refresh_from_db()
+        self.assertEqual(self.profile2.reputation_score, 20)
+        self.assertTrue(self.question1.is_solutioned)
+
+    def test_partial_refresh_keeps_pending_changes_of_other_fields(self):
+        answer = Answer.objects.get(pk=self.answer1.pk)
+        answer.is_accepted = True
+
+        answer.refresh_from_db(fields=['content'])
+
+        self.assertTrue(answer.has_changed('is_accepted'))
+
+    def test_answer_built_by_hand_with_existing_pk_detects_acceptance(self):
+        answer = Answer(
+            pk=self.answer1.pk,
+            content=self.answer1.content,
+            author=self.profile2,
+            question=self.question1,
+            created_at=self.answer1.created_at,
+            is_accepted=True
+        )
+
+        self.assertTrue(answer.has_changed('is_accepted'))
+        answer.save()
+
+        self.profile2.refresh_from_db()
+        self.question1.refresh_from_db()
+        self.assertEqual(self.profile2.reputation_score, 20)
+        self.assertTrue(self.question1.is_solutioned)
@@ -1,19 +1,16 @@
-from django.conf import settings
-from django.core.cache import caches
-from rest_framework import generics, status
+from rest_framework import generics
 from rest_framework.permissions import IsAdminUser, IsAuthenticated, AllowAny
-from rest_framework.response import Response
 from rest_framework.filters import OrderingFilter
 from drf_spectacular.utils import extend_schema
+from app.async_views import AsyncReadMixin
+from app.cache import ViewCacheEntry
+from app.pagination import KeysetPagination
 from answers.models import Answer
 from profiles.models import UserProfile
 from answers.serializers import AnswerModelSerializer, AnswerDetailModelSerializer, AnswerSolutionedModelSerializer, AnswerUpdateModelSerializer
 from profiles.permissions import IsOwner, IsOwnerQuestion
 
 
-cache_view = caches['view_cache']
-
-
 @extend_schema(
     tags=['Answer (Resposta)']
 )
@@ -33,28 +30,23 @@ class AnswerCreateView(generics.CreateAPIView):
 @extend_schema(
     tags=['Answer (Resposta)']
 )
-class AnswerListView(generics.ListAPIView):
+class AnswerListView(AsyncReadMixin, generics.ListAPIView):
     serializer_class = AnswerModelSerializer
     permission_classes = [IsAdminUser]
     filter_backends = [OrderingFilter]
+    pagination_class = KeysetPagination
     ordering = ['created_at']
 
     def get_queryset(self):
         question = self.kwargs.get('question_pk')
-        return Answer.objects.filter(question__pk=question.pk)
+        return Answer.objects.filter(question__pk=question)
 
-    def list(self, request, *args, **kwargs):
+    def get_cache_entry(self, request, *args, **kwargs):
         question = self.kwargs.get('question_pk')
-        key = f"answers_question_list_{question}"
-        cached_data = cache_view.get(key)
+        return ViewCacheEntry.for_list(self, request, f"answers_question_list_{question}", f"question_{question}")
 
-        if cached_data:
-            return Response(cached_data, status=status.HTTP_200_OK)
-
-        response = super().list(request, *args, **kwargs)
-        cache_view.set(key, response.data, timeout=settings.CACHE_TTL)
-
-        return response
+    def list(self, request, *args, **kwargs):
+        return self.get_cache_entry(request).get_or_build(super().list, request, *args, **kwargs)
 
 
 @extend_schema(
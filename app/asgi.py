@@ -9,8 +9,17 @@ https://docs.djangoproject.com/en/5.2/howto/deployment/asgi/
 
 import os
 
-from django.core.asgi import get_asgi_application
+import django
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'app.settings')
+# Each request may run in a different thread, so persistent connections
+# would pile up instead of being reused; only the pool is safe here.
+os.environ['DB_CONN_MAX_AGE'] = '0'
 
-application = get_asgi_application()
+# What django.core.asgi.get_asgi_application() does, with the handler that
+# serves the async read views.
+django.setup(set_prefix=False)
+
+from app.async_views import AsyncReadASGIHandler  # noqa: E402
+
+application = AsyncReadASGIHandler()
@@ -0,0 +1,102 @@
+from asgiref.sync import sync_to_async
+from django.core.handlers.asgi import ASGIHandler
+from django.utils.decorators import classonlymethod
+from rest_framework.renderers import JSONRenderer
+from app.cache import build_http_response
+
+
+READ_METHODS = ('GET', 'HEAD')
+
+
+class AsyncReadMixin:
+    """Serves reads of a DRF view from an async fast path.
+
+    ``as_async_view()`` returns the regular view with a coroutine version
+    attached, which only AsyncReadASGIHandler serves; under WSGI the
+    requests never leave the sync path. In the coroutine view a GET first runs
+    authentication, permissions and content negotiation (all stateless
+    here) and then ``async_get``, which by default answers from the view's
+    ``get_cache_entry`` with async Redis calls. When ``async_get`` returns
+    None, and for any other method or error, the regular synchronous view
+    handles the request in a worker thread.
+    """
+
+    def get_cache_entry(self, request, *args, **kwargs):
+        return None
+
+    async def async_get(self, request, *args, **kwargs):
+        cache_entry = self.get_cache_entry(request, *args, **kwargs)
+        if cache_entry is None:
+            return None
+
+        envelope = await cache_entry.aget_fresh_envelope()
+        if envelope is None:
+            return None
+
+        return build_http_response(envelope, request)
+
+    @classonlymethod
+    def as_async_view(cls, **initkwargs):
+        sync_view = cls.as_view(**initkwargs)
+        threaded_view = sync_to_async(sync_view)
+
+        async def view(request, *args, **kwargs):
+            if request.method in READ_METHODS:
+                response = await cls(**initkwargs).dispatch_async_read(request, *args, **kwargs)
+                if response is not None:
+                    return response
+
+            return await threaded_view(request, *args, **kwargs)
+
+        # What DRF's as_view() exposes, so schema generation keeps working.
+        view.cls = cls
+        view.initkwargs = initkwargs
+        view.csrf_exempt = True
+
+        sync_view.async_view = view
+        return sync_view
+
+    async def dispatch_async_read(self, request, *args, **kwargs):
+        self.args = args
+        self.kwargs = kwargs
+        request = self.initialize_request(request, *args, **kwargs)
+        self.request = request
+        self.headers = self.default_response_headers
+
+        try:
+            self.initial(request, *args, **kwargs)
+        except Exception:
+            # Error responses are left to the sync view.
+            return None
+
+        # Only JSON is cached, as in ViewCacheEntry.get_or_build.
+        if not isinstance(request.accepted_renderer, JSONRenderer):
+            return None
+
+        response = await self.async_get(request, *args, **kwargs)
+        if response is None:
+            return None
+
+        response = self.finalize_response(request, response, *args, **kwargs)
+        if hasattr(response, 'render'):
+            response.render()
+
+        return response
+
+
+class AsyncViewResolverMixin:
+    """For request handlers running in an event loop: serves the coroutine
+    view attached by ``as_async_view()`` in place of the regular one."""
+
+    def resolve_request(self, request):
+        resolver_match = super().resolve_request(request)
+
+        async_view = getattr(resolver_match.func, 'async_view', None)
+        if async_view is not None:
+            resolver_match.func = async_view
+
+        return resolver_match
+
+
+class AsyncReadASGIHandler(AsyncViewResolverMixin, ASGIHandler):
+    pass
@@ -0,0 +1,456 @@
+import asyncio
+import gzip
+import hashlib
+import random
+import re
+import time
+import weakref
+from contextlib import nullcontext
+from contextvars import ContextVar
+from functools import partial
+from urllib.parse import urlencode
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+from django.core.cache import caches
+from django.db import transaction
+from django.http import HttpResponse
+from django.utils.cache import get_conditional_response, patch_vary_headers
+from django.utils.http import http_date, quote_etag
+from redis import asyncio as redis_asyncio
+from redis.exceptions import LockError
+from rest_framework import status
+from rest_framework.renderers import JSONRenderer
+from app.local_cache import local_cache, local_cache_available, publish_invalidation
+from app.replicas import primary_reads
+
+
+cache_view = caches['view_cache']
+
+ACCEPTS_GZIP = re.compile(r'\bgzip\b')
+
+# redis.asyncio connections belong to the event loop that opened them.
+_async_clients = weakref.WeakKeyDictionary()
+
+# Namespaces bumped during the current request, see CacheInvalidationMiddleware.
+_request_invalidations = ContextVar('request_invalidations', default=None)
+
+
+def async_view_cache():
+    """redis.asyncio client on the view_cache server, for the running loop."""
+    loop = asyncio.get_running_loop()
+    client = _async_clients.get(loop)
+    if client is None:
+        location = settings.CACHES['view_cache']['LOCATION']
+        if not isinstance(location, str):
+            location = location[0]
+        client = _async_clients[loop] = redis_asyncio.Redis.from_url(location)
+
+    return client
+
+
+def generation_key(namespace: str) -> str:
+    return f"{namespace}:generation"
+
+
+def bumped_key(namespace: str) -> str:
+    return f"{namespace}:bumped_at"
+
+
+def initial_generation() -> int:
+    # Seeded from the clock so a generation evicted from Redis never comes
+    # back with a value that still matches entries written before eviction.
+    return int(time.time() * 1000)
+
+
+def get_generations(*namespaces: str) -> list:
+    keys = [generation_key(namespace) for namespace in namespaces]
+    stored = cache_view.get_many(keys)
+
+    generations = []
+    for key in keys:
+        if key not in stored:
+            generation = initial_generation()
+            if not cache_view.add(key, generation, timeout=None):
+                generation = cache_view.get(key, generation)
+            stored[key] = generation
+
+        generations.append(int(stored[key]))
+
+    return generations
+
+
+async def aget_generations(*namespaces: str):
+    """Async version of get_generations that never seeds a generation;
+    returns None when one is missing so the caller falls back to sync."""
+    keys = [cache_view.client.make_key(generation_key(namespace)) for namespace in namespaces]
+    values = await async_view_cache().mget(keys)
+    if any(value is None for value in values):
+        return None
+
+    return [int(cache_view.client.decode(value)) for value in values]
+
+
+def namespace_version(namespace: str) -> int:
+    return get_generations(namespace)[0]
+
+
+def recently_bumped(*namespaces: str) -> bool:
+    """True when any of ``namespaces`` was bumped in the last
+    DB_REPLICA_STICKY_SECONDS, while replicas may still lag behind it."""
+    return bool(cache_view.get_many([bumped_key(namespace) for namespace in namespaces]))
+
+
+def bump_namespace(*namespaces: str):
+    """Invalidates every entry cached under ``namespaces``.
+
+    Inside a transaction the bump waits for the commit, so a concurrent
+    reader cannot refill the cache from the pre-commit snapshot, and is
+    dropped on rollback. During a request handled by
+    CacheInvalidationMiddleware the bumps are collected and sent once, in a
+    single pipeline, when the response is ready.
+    """
+    connection = transaction.get_connection()
+    if not in_transaction(connection):
+        dispatch_invalidation(namespaces)
+        return
+
+    if not hasattr(connection, 'pending_invalidations'):
+        connection.pending_invalidations = set()
+    connection.pending_invalidations.update(namespaces)
+    # One callback per bump, so a rolled back savepoint cannot drop the
+    # flush of bumps made outside it; the first one to run sends them all.
+    # Bumps left from a rolled back transaction go out with the next commit,
+    # which only costs a cache miss.
+    transaction.on_commit(partial(_flush_transaction, connection))
+
+
+def in_transaction(connection) -> bool:
+    # The atomic blocks TestCase wraps each test in never commit; treated
+    # like autocommit, as Django does when checking durable blocks.
+    return any(not getattr(block, '_from_testcase', False) for block in connection.atomic_blocks)
+
+
+def _flush_transaction(connection):
+    pending, connection.pending_invalidations = connection.pending_invalidations, set()
+    dispatch_invalidation(pending)
+
+
+def dispatch_invalidation(namespaces):
+    pending = _request_invalidations.get()
+    if pending is None:
+        flush_invalidations(namespaces)
+    else:
+        pending.update(namespaces)
+
+
+def flush_invalidations(namespaces):
+    """Bumps the generations of ``namespaces`` in one Redis round trip."""
+    namespaces = sorted(set(namespaces))
+    if not namespaces:
+        return
+
+    initial = cache_view.client.encode(initial_generation())
+    bumped_at = cache_view.client.encode(int(time.time()))
+    with cache_view.client.get_client(write=True).pipeline(transaction=False) as pipeline:
+        for namespace in namespaces:
+            key = cache_view.client.make_key(generation_key(namespace))
+            # Seeds a missing generation from the clock before incrementing it.
+            pipeline.set(key, initial, nx=True)
+            pipeline.incr(key)
+            if settings.DATABASE_REPLICAS:
+                pipeline.set(
+                    cache_view.client.make_key(bumped_key(namespace)), bumped_at,
+                    ex=settings.DB_REPLICA_STICKY_SECONDS
+                )
+        pipeline.execute()
+
+    publish_invalidation(*namespaces)
+
+
+class CacheInvalidationMiddleware:
+    """Collects the cache invalidations of a request, committed ones only,
+    and flushes them in a single pipeline before the response is returned."""
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+
+        pending = set()
+        token = _request_invalidations.set(pending)
+        try:
+            return self.get_response(request)
+        finally:
+            _request_invalidations.reset(token)
+            flush_invalidations(pending)
+
+    async def __acall__(self, request):
+        pending = set()
+        token = _request_invalidations.set(pending)
+        try:
+            return await self.get_response(request)
+        finally:
+            _request_invalidations.reset(token)
+            if pending:
+                await sync_to_async(flush_invalidations)(pending)
+
+
+def build_cache_key(prefix: str, *namespaces: str) -> str:
+    return format_cache_key(prefix, get_generations(*namespaces))
+
+
+def format_cache_key(prefix: str, generations) -> str:
+    return f"{prefix}:v" + "-".join(str(generation) for generation in generations)
+
+
+class ViewCacheEntry:
+    """A view_cache entry keyed by the generations of its namespaces.
+
+    The entry holds the rendered JSON body (gzipped above a size threshold)
+    so hits are answered without running serializers or renderers. With
+    ``local=True`` hits are served from the per-worker cache first,
+    skipping both the generation lookup and the Redis GET.
+    """
+
+    def __init__(self, prefix: str, *namespaces: str, local: bool = False):
+        self.prefix = prefix
+        self.namespaces = namespaces or (prefix,)
+        self.local = local and local_cache_available()
+        self.sequence = local_cache.sequence
+        self._key = None
+
+    @classmethod
+    def for_list(cls, view, request, prefix: str, *namespaces: str, local: bool = False):
+        return cls(build_list_cache_prefix(view, request, prefix), *(namespaces or (prefix,)), local=local)
+
+    @property
+    def key(self) -> str:
+        if self._key is None:
+            self._key = build_cache_key(self.prefix, *self.namespaces)
+        return self._key
+
+    def get(self):
+        envelope = self._get_envelope()
+        if envelope is None:
+            return None
+
+        return decode_body(envelope)
+
+    def set(self, body: bytes, content_type: str, timeout: int = None) -> dict:
+        if timeout is None:
+            timeout = settings.CACHE_TTL
+
+        timeout += random.randint(0, int(timeout * settings.VIEW_CACHE_TTL_JITTER))
+        now = time.time()
+        envelope = {
+            'body': body,
+            'encoding': None,
+            'content_type': content_type,
+            'etag': hashlib.sha1(body).hexdigest(),
+            'built_at': int(now),
+            'fresh_until': now + timeout,
+        }
+        if settings.VIEW_CACHE_COMPRESS and len(body) >= settings.VIEW_CACHE_COMPRESS_MIN_BYTES:
+            envelope['body'] = gzip.compress(body, compresslevel=6)
+            envelope['encoding'] = 'gzip'
+
+        # The entry outlives its freshness by the grace window so one worker
+        # can rebuild it while the others keep serving the stale copy.
+        cache_view.set(self.key, envelope, timeout=timeout + settings.VIEW_CACHE_STALE_GRACE)
+        if self.local:
+            local_cache.set(self.prefix, envelope, self.namespaces, self.sequence)
+
+        return envelope
+
+    def get_or_build(self, build, request, *args, **kwargs):
+        # Only JSON is stored; the browsable API and other renderers are
+        # built on every request.
+        if not isinstance(request.accepted_renderer, JSONRenderer):
+            return build(request, *args, **kwargs)
+
+        envelope = self._get_envelope()
+        if envelope is not None and envelope['fresh_until'] > time.time():
+            return build_http_response(envelope, request)
+
+        lock = cache_view.lock(f"{self.key}:lock", timeout=settings.VIEW_CACHE_LOCK_TIMEOUT)
+        if lock.acquire(blocking=False):
+            try:
+                return self._build(build, request, *args, **kwargs)
+            finally:
+                try:
+                    lock.release()
+                except LockError:
+                    pass
+
+        if envelope is None:
+            envelope = self._wait_for_envelope()
+
+        if envelope is not None:
+            return build_http_response(envelope, request)
+
+        return self._build(build, request, *args, **kwargs)
+
+    async def aget_fresh_envelope(self):
+        """Non-blocking hit path of get_or_build. Returns None on a miss or
+        a stale entry, which the sync path then rebuilds under its lock."""
+        envelope = local_cache.get(self.prefix) if self.local else None
+
+        if envelope is None:
+            generations = await aget_generations(*self.namespaces)
+            if generations is None:
+                return None
+
+            self._key = format_cache_key(self.prefix, generations)
+            value = await async_view_cache().get(cache_view.client.make_key(self._key))
+            if value is None:
+                return None
+
+            envelope = cache_view.client.decode(value)
+            if self.local:
+                local_cache.set(self.prefix, envelope, self.namespaces, self.sequence)
+
+        if envelope['fresh_until'] <= time.time():
+            return None
+
+        return envelope
+
+    def _build(self, build, request, *args, **kwargs):
+        # Shared entries outlive the request: built from a lagging replica
+        # right after a bump, they would cache the old data under the new
+        # generation for everyone, the writer included. Only those misses
+        # are built on the primary.
+        stale_replicas = settings.DATABASE_REPLICAS and recently_bumped(*self.namespaces)
+        with primary_reads() if stale_replicas else nullcontext():
+            response = build(request, *args, **kwargs)
+        if response.status_code != status.HTTP_200_OK:
+            return response
+
+        view = request.parser_context['view']
+        renderer = request.accepted_renderer
+        renderer_context = view.get_renderer_context()
+        renderer_context['response'] = response
+
+        body = renderer.render(response.data, request.accepted_media_type, renderer_context)
+        content_type = renderer.media_type
+        if renderer.charset:
+            content_type = f"{content_type}; charset={renderer.charset}"
+
+        envelope = self.set(body, content_type)
+        return build_http_response(envelope, request)
+
+    def _get_envelope(self):
+        if self.local:
+            envelope = local_cache.get(self.prefix)
+            if envelope is not None:
+                return envelope
+
+        envelope = cache_view.get(self.key)
+        if envelope is not None and self.local:
+            local_cache.set(self.prefix, envelope, self.namespaces, self.sequence)
+
+        return envelope
+
+    def _wait_for_envelope(self):
+        deadline = time.monotonic() + settings.VIEW_CACHE_LOCK_WAIT
+        while time.monotonic() < deadline:
+            time.sleep(0.05)
+            envelope = cache_view.get(self.key)
+            if envelope is not None:
+                return envelope
+
+        return None
+
+
+def decode_body(envelope: dict) -> bytes:
+    if envelope['encoding'] == 'gzip':
+        return gzip.decompress(envelope['body'])
+
+    return envelope['body']
+
+
+def build_http_response(envelope: dict, request) -> HttpResponse:
+    send_encoded = envelope['encoding'] is not None and bool(
+        ACCEPTS_GZIP.search(request.META.get('HTTP_ACCEPT_ENCODING', ''))
+    )
+
+    headers = {}
+    if envelope.get('etag'):
+        # Each content-coding is a different representation, so it gets its
+        # own strong validator.
+        etag = envelope['etag'] + (f"-{envelope['encoding']}" if send_encoded else '')
+        headers['ETag'] = quote_etag(etag)
+        headers['Last-Modified'] = http_date(envelope['built_at'])
+
+        conditional_response = get_conditional_response(
+            request,
+            etag=headers['ETag'],
+            last_modified=envelope['built_at'],
+        )
+        if conditional_response is not None:
+            return apply_cache_headers(conditional_response, headers, envelope)
+
+    if send_encoded:
+        response = HttpResponse(envelope['body'], content_type=envelope['content_type'])
+        response['Content-Encoding'] = envelope['encoding']
+    else:
+        response = HttpResponse(decode_body(envelope), content_type=envelope['content_type'])
+
+    return apply_cache_headers(response, headers, envelope)
+
+
+def apply_cache_headers(response: HttpResponse, headers: dict, envelope: dict) -> HttpResponse:
+    for header, value in headers.items():
+        response[header] = value
+
+    if envelope['encoding'] is not None:
+        patch_vary_headers(response, ['Accept-Encoding'])
+
+    return response
+
+
+def get_list_query_params(view) -> set:
+    params = set()
+
+    filterset_class = getattr(view, 'filterset_class', None)
+    if filterset_class is not None:
+        params.update(filterset_class.base_filters.keys())
+
+    params.update(getattr(view, 'filterset_fields', None) or [])
+
+    for backend in getattr(view, 'filter_backends', []):
+        for attribute in ('search_param', 'ordering_param'):
+            param = getattr(backend, attribute, None)
+            if param:
+                params.add(param)
+
+    paginator = getattr(view, 'paginator', None)
+    if paginator is not None:
+        for attribute in ('page_query_param', 'page_size_query_param', 'limit_query_param',
+                          'offset_query_param', 'cursor_query_param'):
+            param = getattr(paginator, attribute, None)
+            if param:
+                params.add(param)
+
+    return params
+
+
+def build_list_cache_prefix(view, request, prefix: str) -> str:
+    allowed_params = get_list_query_params(view)
+    # Empty values are kept: an empty ?cursor= still switches the list to
+    # keyset pagination.
+    query_params = sorted(
+        (name, value.strip())
+        for name in request.query_params
+        if name in allowed_params
+        for value in request.query_params.getlist(name)
+    )
+    digest = hashlib.md5(urlencode(query_params).encode()).hexdigest()
+
+    return f"{prefix}:{digest}"
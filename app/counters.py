@@ -0,0 +1,131 @@
+from django.db import connection
+from django.db.models import Count, F, IntegerField, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce, Greatest
+
+
+class M2MCounter:
+    """Keeps a counter column in sync with a many-to-many relation.
+
+    Every change is applied as a single ``UPDATE ... SET counter = counter
+    +/- n`` so concurrent writers never lose increments. Removals only count
+    the rows that actually existed, which are looked up in ``pre_remove``.
+    """
+
+    def __init__(self, related_descriptor, counter_field: str):
+        field = related_descriptor.field
+        self.model = field.model
+        self.through = related_descriptor.through
+        self.counter_field = counter_field
+        self.source_field = field.m2m_field_name()
+        self.target_field = field.m2m_reverse_field_name()
+        self.pending_attribute = f'_pending_{self.through._meta.db_table}'
+
+    def handle(self, instance, action, reverse, pk_set, **kwargs):
+        if action == 'post_add' and pk_set:
+            if reverse:
+                self.apply(pk_set, 1)
+            else:
+                self.apply([instance.pk], len(pk_set))
+
+        elif action == 'pre_remove' and pk_set:
+            setattr(instance, self.pending_attribute, self.existing_links(instance, reverse, pk_set))
+
+        elif action == 'pre_clear':
+            setattr(instance, self.pending_attribute, self.existing_links(instance, reverse))
+
+        elif action in ('post_remove', 'post_clear'):
+            removed = getattr(instance, self.pending_attribute, [])
+            if hasattr(instance, self.pending_attribute):
+                delattr(instance, self.pending_attribute)
+
+            if reverse:
+                self.apply(removed, -1)
+            elif removed:
+                self.apply([instance.pk], -len(removed))
+
+    def existing_links(self, instance, reverse: bool, pk_set=None) -> list:
+        if reverse:
+            links = self.through.objects.filter(**{f'{self.target_field}_id': instance.pk})
+            if pk_set is not None:
+                links = links.filter(**{f'{self.source_field}_id__in': pk_set})
+            return list(links.values_list(f'{self.source_field}_id', flat=True))
+
+        links = self.through.objects.filter(**{f'{self.source_field}_id': instance.pk})
+        if pk_set is not None:
+            links = links.filter(**{f'{self.target_field}_id__in': pk_set})
+        return list(links.values_list(f'{self.target_field}_id', flat=True))
+
+    def apply(self, pks, delta: int):
+        if not pks or not delta:
+            return
+
+        self.model.objects.filter(pk__in=pks).update(
+            **{self.counter_field: Greatest(F(self.counter_field) + delta, Value(0))}
+        )
+
+    def toggle(self, instance_pk, target_pk):
+        """Removes the link when it exists and creates it otherwise.
+
+        Membership, the through table write and the counter update happen in
+        one statement, so the cost does not grow with the size of the
+        relation. ``m2m_changed`` is not sent; callers invalidate their own
+        caches. Returns ``(linked, count)``, or ``None`` when the instance
+        does not exist.
+        """
+        quote = connection.ops.quote_name
+        through = quote(self.through._meta.db_table)
+        source = quote(self.through._meta.get_field(self.source_field).column)
+        target = quote(self.through._meta.get_field(self.target_field).column)
+        table = quote(self.model._meta.db_table)
+        pk = quote(self.model._meta.pk.column)
+        counter = quote(self.model._meta.get_field(self.counter_field).column)
+
+        sql = f"""
+            WITH removed AS (
+                DELETE FROM {through}
+                WHERE {source} = %(instance)s AND {target} = %(target)s
+                RETURNING 1
+            ), inserted AS (
+                INSERT INTO {through} ({source}, {target})
+                SELECT %(instance)s, %(target)s
+                WHERE NOT EXISTS (SELECT 1 FROM removed)
+                  AND EXISTS (SELECT 1 FROM {table} WHERE {pk} = %(instance)s)
+                ON CONFLICT DO NOTHING
+                RETURNING 1
+            )
+            UPDATE {table}
+            SET {counter} = GREATEST(
+                {counter} + (SELECT COUNT(*) FROM inserted) - (SELECT COUNT(*) FROM removed), 0
+            )
+            WHERE {pk} = %(instance)s
+            RETURNING NOT EXISTS (SELECT 1 FROM removed), {counter}
+        """
+        with connection.cursor() as cursor:
+            cursor.execute(sql, {'instance': instance_pk, 'target': target_pk})
+            row = cursor.fetchone()
+
+        if row is None:
+            return None
+
+        return row[0], row[1]
+
+    def real_count(self):
+        return Coalesce(
+            Subquery(
+                self.through.objects.filter(**{f'{self.source_field}_id': OuterRef('pk')})
+                .values(f'{self.source_field}_id')
+                .annotate(total=Count('pk'))
+                .values('total'),
+                output_field=IntegerField()
+            ),
+            Value(0)
+        )
+
+    def reconcile(self) -> int:
+        return self.model.objects.annotate(
+            real_count=self.real_count()
+        ).exclude(
+            **{self.counter_field: F('real_count')}
+        ).update(
+            **{self.counter_field: self.real_count()}
+        )
@@ -0,0 +1,28 @@
+import django_filters
+
+
+class TrigramNameFilter(django_filters.CharFilter):
+    """Case-insensitive name filter served by the gin_trgm_ops indexes on
+    auth_user.
+
+    Terms with fewer than three characters have no complete trigram, so a
+    substring match would scan the whole index. They are matched as a
+    prefix instead, which still uses the index through the padded trigrams
+    pg_trgm stores for the start of each word.
+    """
+
+    def __init__(self, *args, **kwargs):
+        kwargs.setdefault('lookup_expr', 'icontains')
+        kwargs.setdefault('help_text', (
+            'Busca sem diferenciar maiúsculas. Termos com 3 ou mais caracteres '
+            'casam com qualquer parte do nome; termos menores, apenas com o início.'
+        ))
+        super().__init__(*args, **kwargs)
+
+    def filter(self, qs, value):
+        value = (value or '').strip()
+        if not value:
+            return qs
+
+        lookup = self.lookup_expr if len(value) >= 3 else 'istartswith'
+        return self.get_method(qs)(**{f'{self.field_name}__{lookup}': value})
@@ -0,0 +1,83 @@
+import hashlib
+import posixpath
+from io import BytesIO
+from django.conf import settings
+from django.core.files.base import ContentFile
+from drf_spectacular.utils import extend_schema_field
+from PIL import Image, ImageOps
+from rest_framework import serializers
+
+
+def needs_variants(field_file, variants: dict) -> bool:
+    return bool(field_file) and variants.get('source') != field_file.name
+
+
+def build_variants(field_file, sizes: dict, crop: bool = False) -> dict:
+    """Renders ``field_file`` as a WebP image for each of ``sizes`` (name to
+    pixels) and stores them under ``variants/`` next to the original.
+
+    Files are named after a hash of their content, so they can be cached
+    forever and identical uploads share the same files. With ``crop`` the
+    variants are squares; otherwise the aspect ratio is kept.
+    """
+    storage = field_file.storage
+    directory = posixpath.join(posixpath.dirname(field_file.name), 'variants')
+
+    with field_file.open('rb'):
+        image = ImageOps.exif_transpose(Image.open(field_file))
+        image = image.convert('RGBA' if has_transparency(image) else 'RGB')
+
+    variants = {'source': field_file.name}
+    for name, size in sizes.items():
+        if crop:
+            side = min(size, *image.size)
+            resized = ImageOps.fit(image, (side, side), Image.Resampling.LANCZOS)
+        else:
+            resized = image.copy()
+            resized.thumbnail((size, size), Image.Resampling.LANCZOS)
+
+        buffer = BytesIO()
+        resized.save(buffer, 'WEBP', quality=settings.IMAGE_VARIANT_QUALITY)
+        content = buffer.getvalue()
+
+        path = posixpath.join(directory, f'{hashlib.sha256(content).hexdigest()[:32]}.webp')
+        if not storage.exists(path):
+            path = storage.save(path, ContentFile(content))
+        variants[name] = path
+
+    return variants
+
+
+def has_transparency(image) -> bool:
+    return image.mode in ('RGBA', 'LA', 'PA') or 'transparency' in image.info
+
+
+@extend_schema_field({
+    'type': 'object',
+    'nullable': True,
+    'additionalProperties': {'type': 'string', 'format': 'uri'},
+})
+class ImageVariantsField(serializers.Field):
+    """URLs of the variants stored in ``<field>_variants`` by build_variants,
+    or None while they are not generated for the current image."""
+
+    def __init__(self, image_field: str, **kwargs):
+        self.image_field = image_field
+        kwargs.update(source='*', read_only=True)
+        super().__init__(**kwargs)
+
+    def to_representation(self, instance):
+        field_file = getattr(instance, self.image_field)
+        variants = getattr(instance, f'{self.image_field}_variants')
+        if not field_file or needs_variants(field_file, variants):
+            return None
+
+        request = self.context.get('request')
+        urls = {}
+        for name, path in variants.items():
+            if name == 'source':
+                continue
+            url = field_file.storage.url(path)
+            urls[name] = request.build_absolute_uri(url) if request is not None else url
+
+        return urls
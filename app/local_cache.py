@@ -0,0 +1,162 @@
+import logging
+import pickle
+import threading
+import time
+from collections import OrderedDict
+from django.conf import settings
+from django_redis import get_redis_connection
+
+
+logger = logging.getLogger(__name__)
+
+INVALIDATION_CHANNEL = 'view_cache:invalidate'
+
+
+class LocalCache:
+    """Per-worker LRU in front of the view_cache alias.
+
+    Entries are tagged with the generation namespaces they depend on and
+    are dropped when an invalidation for one of them arrives over pub/sub.
+    """
+
+    def __init__(self, max_entries: int, max_bytes: int, ttl: int):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.sequence = 0
+        self.size = 0
+        self._entries = OrderedDict()
+        self._namespaces = {}
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: str):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+
+            expires_at, value, _, _ = entry
+            if expires_at <= time.monotonic():
+                self._remove(key)
+                return None
+
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: str, value, namespaces, sequence: int):
+        size = len(pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL))
+        if size > self.max_bytes:
+            return
+
+        with self._lock:
+            # An invalidation arrived while the value was being read or built,
+            # so it may already be stale.
+            if sequence != self.sequence:
+                return
+
+            if key in self._entries:
+                self._remove(key)
+
+            self._entries[key] = (time.monotonic() + self.ttl, value, size, tuple(namespaces))
+            self.size += size
+            for namespace in namespaces:
+                self._namespaces.setdefault(namespace, set()).add(key)
+
+            while self._entries and (len(self._entries) > self.max_entries or self.size > self.max_bytes):
+                self._remove(next(iter(self._entries)))
+
+    def invalidate(self, *namespaces: str):
+        with self._lock:
+            self.sequence += 1
+            for namespace in namespaces:
+                for key in self._namespaces.pop(namespace, set()):
+                    self._remove(key)
+
+    def clear(self):
+        with self._lock:
+            self.sequence += 1
+            self._entries.clear()
+            self._namespaces.clear()
+            self.size = 0
+
+    def _remove(self, key: str):
+        _, _, size, namespaces = self._entries.pop(key)
+        self.size -= size
+        for namespace in namespaces:
+            keys = self._namespaces.get(namespace)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._namespaces[namespace]
+
+
+class InvalidationListener(threading.Thread):
+
+    def __init__(self, cache: LocalCache):
+        super().__init__(name='view-cache-invalidation', daemon=True)
+        self.cache = cache
+        self.connected = threading.Event()
+
+    def run(self):
+        while True:
+            try:
+                pubsub = get_redis_connection('view_cache').pubsub()
+                pubsub.subscribe(INVALIDATION_CHANNEL)
+                for message in pubsub.listen():
+                    if message['type'] == 'subscribe':
+                        # Anything cached before the subscription was active
+                        # may have missed its invalidation.
+                        self.cache.clear()
+                        self.connected.set()
+                        continue
+
+                    if message['type'] != 'message':
+                        continue
+
+                    data = message['data']
+                    if isinstance(data, bytes):
+                        data = data.decode()
+                    self.cache.invalidate(*data.split('\n'))
+
+            except Exception:
+                logger.exception('Lost the view cache invalidation channel, retrying')
+
+            self.connected.clear()
+            self.cache.clear()
+            time.sleep(1)
+
+
+local_cache = LocalCache(
+    max_entries=settings.VIEW_CACHE_LOCAL_MAX_ENTRIES,
+    max_bytes=settings.VIEW_CACHE_LOCAL_MAX_BYTES,
+    ttl=settings.VIEW_CACHE_LOCAL_TTL,
+)
+
+_listener = None
+_listener_lock = threading.Lock()
+
+
+def local_cache_available() -> bool:
+    global _listener
+
+    if not settings.VIEW_CACHE_LOCAL_ENABLED:
+        return False
+
+    if _listener is None:
+        with _listener_lock:
+            if _listener is None:
+                _listener = InvalidationListener(local_cache)
+                _listener.start()
+
+    return _listener.connected.is_set()
+
+
+def publish_invalidation(*namespaces: str):
+    if not settings.VIEW_CACHE_LOCAL_ENABLED or not namespaces:
+        return
+
+    local_cache.invalidate(*namespaces)
+    get_redis_connection('view_cache').publish(INVALIDATION_CHANNEL, '\n'.join(namespaces))
@@ -0,0 +1,138 @@
+import asyncio
+import io
+import threading
+import time
+from django.core.management.base import BaseCommand, CommandError
+from django.core.wsgi import get_wsgi_application
+from django.db import connections
+from django.test.utils import override_settings
+from app.async_views import AsyncReadASGIHandler
+
+
+HOST = 'benchmark.local'
+
+
+class Command(BaseCommand):
+    help = (
+        'Compara requisições por segundo do handler WSGI (views síncronas, '
+        'uma thread por requisição em andamento) e do ASGI do projeto (views '
+        'assíncronas em um único event loop) em leituras que acertam o cache. '
+        'Roda dentro do processo, sem servidor HTTP.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--path', default='/api/v1/questions/')
+        parser.add_argument('--requests', type=int, default=5_000)
+        parser.add_argument('--concurrency', type=int, default=50)
+
+    def handle(self, *args, **options):
+        path, total, concurrency = options['path'], options['requests'], options['concurrency']
+
+        with override_settings(ALLOWED_HOSTS=[HOST]):
+            wsgi_rate = self.run_wsgi(get_wsgi_application(), path, total, concurrency)
+            asgi_rate = asyncio.run(self.run_asgi(AsyncReadASGIHandler(), path, total, concurrency))
+
+        connections.close_all()
+
+        self.stdout.write(f'{total} requisições a {path}, {concurrency} simultâneas')
+        self.stdout.write(f'  WSGI ({concurrency} threads): {wsgi_rate:.0f} req/s')
+        self.stdout.write(f'  ASGI (1 event loop): {asgi_rate:.0f} req/s')
+
+    def run_wsgi(self, application, path: str, total: int, concurrency: int) -> float:
+        def request():
+            status = []
+            environ = {
+                'REQUEST_METHOD': 'GET',
+                'PATH_INFO': path,
+                'QUERY_STRING': '',
+                'SERVER_NAME': HOST,
+                'SERVER_PORT': '80',
+                'HTTP_HOST': HOST,
+                'wsgi.input': io.BytesIO(),
+                'wsgi.url_scheme': 'http',
+            }
+            body = application(environ, lambda code, headers: status.append(code))
+            b''.join(body)
+            body.close()
+            return status[0]
+
+        # Warms the cache; every measured request is a hit.
+        self.check_status(request())
+
+        errors = []
+
+        def worker(requests: int):
+            try:
+                for _ in range(requests):
+                    self.check_status(request())
+            except Exception as error:
+                errors.append(error)
+            finally:
+                connections.close_all()
+
+        per_thread = total // concurrency
+        workers = [threading.Thread(target=worker, args=(per_thread,)) for _ in range(concurrency)]
+
+        started = time.perf_counter()
+        for thread in workers:
+            thread.start()
+        for thread in workers:
+            thread.join()
+        elapsed = time.perf_counter() - started
+
+        if errors:
+            raise CommandError(errors[0])
+
+        return per_thread * concurrency / elapsed
+
+    async def run_asgi(self, application, path: str, total: int, concurrency: int) -> float:
+        async def request():
+            scope = {
+                'type': 'http',
+                'asgi': {'version': '3.0'},
+                'http_version': '1.1',
+                'method': 'GET',
+                'scheme': 'http',
+                'path': path,
+                'raw_path': path.encode(),
+                'query_string': b'',
+                'headers': [(b'host', HOST.encode())],
+                'client': ('127.0.0.1', 0),
+                'server': (HOST, 80),
+            }
+            received = asyncio.Event()
+            status = []
+
+            async def receive():
+                if received.is_set():
+                    # Nothing else to read; Django waits here for a disconnect.
+                    await asyncio.Future()
+                received.set()
+                return {'type': 'http.request', 'body': b'', 'more_body': False}
+
+            async def send(message):
+                if message['type'] == 'http.response.start':
+                    status.append(message['status'])
+
+            await application(scope, receive, send)
+            return status[0]
+
+        self.check_status(await request())
+
+        per_task = total // concurrency
+
+        async def worker():
+            for _ in range(per_task):
+                self.check_status(await request())
+
+        started = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+
+        return per_task * concurrency / (time.perf_counter() - started)
+
+    def check_status(self, status):
+        if isinstance(status, str):
+            status = int(status.split()[0])
+
+        if status != 200:
+            raise CommandError(f'Resposta {status}; confira --path e se há dados para listar.')
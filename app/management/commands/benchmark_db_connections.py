@@ -0,0 +1,84 @@
+import threading
+import time
+from django.core.management.base import BaseCommand, CommandError
+from django.core.signals import request_finished, request_started
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.db.backends.postgresql.psycopg_any import is_psycopg3
+from questions.models import Question
+
+
+class Command(BaseCommand):
+    help = (
+        'Mede requisições por segundo com conexões novas a cada requisição, '
+        'conexões persistentes e o pool do psycopg. Cada requisição simulada '
+        'passa pelos mesmos sinais que o Django usa para abrir e fechar conexões.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--requests', type=int, default=2_000)
+        parser.add_argument('--threads', type=int, default=8)
+
+    def handle(self, *args, **options):
+        settings_dict = connections.settings[DEFAULT_DB_ALIAS]
+        original = {key: settings_dict[key] for key in ('CONN_MAX_AGE', 'OPTIONS')}
+        pool_options = original['OPTIONS'].get('pool') or {
+            'min_size': options['threads'],
+            'max_size': options['threads'],
+        }
+
+        modes = {
+            'Sem persistência': {'CONN_MAX_AGE': 0, 'OPTIONS': {}},
+            'Conexões persistentes': {'CONN_MAX_AGE': 60, 'OPTIONS': {}},
+        }
+        if is_psycopg3:
+            modes['Pool do psycopg'] = {'CONN_MAX_AGE': 0, 'OPTIONS': {'pool': pool_options}}
+        else:
+            self.stdout.write('psycopg 3 não está instalado; o modo com pool foi ignorado.')
+
+        results = {}
+        try:
+            for name, overrides in modes.items():
+                connections.close_all()
+                settings_dict.update(overrides)
+
+                results[name] = self.run(options['requests'], options['threads'])
+
+                connections.close_all()
+                connections[DEFAULT_DB_ALIAS].close_pool()
+        finally:
+            settings_dict.update(original)
+
+        self.stdout.write(f'\n{options["requests"]} requisições em {options["threads"]} threads')
+        for name, rate in results.items():
+            self.stdout.write(f'  {name}: {rate:.0f} req/s')
+
+    def run(self, total: int, threads: int) -> float:
+        self.errors = []
+        per_thread = total // threads
+        workers = [threading.Thread(target=self.worker, args=(per_thread,)) for _ in range(threads)]
+
+        started = time.perf_counter()
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join()
+
+        if self.errors:
+            raise CommandError(self.errors[0])
+
+        return per_thread * threads / (time.perf_counter() - started)
+
+    def worker(self, requests: int):
+        try:
+            for _ in range(requests):
+                # close_old_connections is connected to both signals, exactly
+                # as in a request served by the WSGI handler.
+                request_started.send(sender=self.__class__)
+                try:
+                    list(Question.objects.filter(is_published=True).order_by('-created_at', '-pk')[:50])
+                finally:
+                    request_finished.send(sender=self.__class__)
+        except Exception as error:
+            self.errors.append(error)
+        finally:
+            connections.close_all()
@@ -0,0 +1,160 @@
+import re
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.db.models import Count, Max, Q
+from articles.models import Article
+from profiles.models import UserProfile
+from questions.models import Question
+
+
+LIST_INDEXES = [
+    'question_published_created_idx',
+    'question_unsolved_created_idx',
+    'question_technologies_tech_question_idx',
+    'article_published_created_idx',
+    'article_technologies_tech_article_idx',
+    'answer_accepted_author_idx',
+]
+
+EXECUTION_TIME = re.compile(r'Execution Time: ([\d.]+) ms')
+
+
+class Command(BaseCommand):
+    help = (
+        'Popula um volume de dados de teste e mostra os planos das listagens '
+        'com e sem os índices de listagem. Tudo é desfeito ao final; use um '
+        'banco de desenvolvimento.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=2_000)
+        parser.add_argument('--questions', type=int, default=200_000)
+        parser.add_argument('--articles', type=int, default=50_000)
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            self.seed(options['users'], options['questions'], options['articles'])
+
+            savepoint = transaction.savepoint()
+            with connection.cursor() as cursor:
+                for index in LIST_INDEXES:
+                    cursor.execute(f'DROP INDEX IF EXISTS {connection.ops.quote_name(index)}')
+            before = self.explain_all('Antes (sem os índices de listagem)')
+            transaction.savepoint_rollback(savepoint)
+
+            after = self.explain_all('Depois (com os índices de listagem)')
+
+            self.stdout.write('\nResumo (Execution Time em ms)')
+            for name in after:
+                self.stdout.write(f'  {name}: {before[name]} -> {after[name]}')
+
+            transaction.set_rollback(True)
+
+    def seed(self, users: int, questions: int, articles: int):
+        last_question = Question.objects.aggregate(last=Max('pk'))['last'] or 0
+        last_article = Article.objects.aggregate(last=Max('pk'))['last'] or 0
+        params = {
+            'users': users,
+            'questions': questions,
+            'articles': articles,
+            'last_question': last_question,
+            'last_article': last_article,
+        }
+
+        statements = [
+            # Independent random columns; deterministic between runs.
+            'SELECT setseed(0.42)',
+            """
+            INSERT INTO auth_user (password, is_superuser, username, first_name, last_name,
+                                   email, is_staff, is_active, date_joined)
+            SELECT '!', false, 'benchmark_' || g, 'Nome' || g, 'Sobrenome' || g,
+                   'benchmark' || g || '@example.com', false, true, now()
+            FROM generate_series(1, %(users)s) g
+            """,
+            """
+            INSERT INTO profiles_userprofile (user_id, bio, expertise, level, reputation_score, is_professional,
+                                              avatar_variants)
+            SELECT id, '', '', 'Iniciante', 0, false, '{}' FROM auth_user WHERE username LIKE 'benchmark\\_%%'
+            """,
+            """
+            INSERT INTO technologies_technology (name, slug, color, prism_lang, logo_variants)
+            SELECT 'benchmark-' || g, 'benchmark-' || g, '#5e6e7d', '', '{}' FROM generate_series(1, 20) g
+            """,
+            """
+            INSERT INTO questions_question (title, content, is_published, is_solutioned, created_at,
+                                            profile_id, likes_count)
+            SELECT 'Pergunta ' || g, 'Conteúdo da pergunta ' || g, random() > 0.1, random() < 0.4,
+                   now() - g * interval '1 minute', p.ids[1 + g %% array_length(p.ids, 1)], 0
+            FROM generate_series(1, %(questions)s) g,
+                 (SELECT array_agg(id) AS ids FROM profiles_userprofile) p
+            """,
+            """
+            INSERT INTO questions_question_technologies (question_id, technology_id)
+            SELECT q.id, t.ids[1 + floor(random() * array_length(t.ids, 1))::int]
+            FROM questions_question q,
+                 (SELECT array_agg(id) AS ids FROM technologies_technology WHERE name LIKE 'benchmark-%%') t
+            WHERE q.id > %(last_question)s
+            """,
+            """
+            INSERT INTO articles_article (title, slug, content, is_published, created_at, author_id, likes_count)
+            SELECT 'Artigo ' || g, 'artigo-' || g, 'Conteúdo do artigo ' || g, random() > 0.1,
+                   now() - g * interval '1 minute', p.ids[1 + g %% array_length(p.ids, 1)], 0
+            FROM generate_series(1, %(articles)s) g,
+                 (SELECT array_agg(id) AS ids FROM profiles_userprofile) p
+            """,
+            """
+            INSERT INTO articles_article_technologies (article_id, technology_id)
+            SELECT a.id, t.ids[1 + floor(random() * array_length(t.ids, 1))::int]
+            FROM articles_article a,
+                 (SELECT array_agg(id) AS ids FROM technologies_technology WHERE name LIKE 'benchmark-%%') t
+            WHERE a.id > %(last_article)s
+            """,
+            # Two answers per question; only the first answer of a question can
+            # be the accepted one.
+            """
+            INSERT INTO answers_answer (content, is_accepted, created_at, author_id, question_id, upvotes_count)
+            SELECT 'Resposta ' || g, g <= array_length(q.ids, 1) AND random() < 0.3,
+                   now() - g * interval '1 second',
+                   p.ids[1 + g %% array_length(p.ids, 1)], q.ids[1 + g %% array_length(q.ids, 1)], 0
+            FROM generate_series(1, 2 * %(questions)s) g,
+                 (SELECT array_agg(id) AS ids FROM profiles_userprofile) p,
+                 (SELECT array_agg(id) AS ids FROM questions_question WHERE id > %(last_question)s) q
+            """,
+            'ANALYZE auth_user, profiles_userprofile, technologies_technology, questions_question, '
+            'questions_question_technologies, articles_article, articles_article_technologies, answers_answer',
+        ]
+
+        with connection.cursor() as cursor:
+            for statement in statements:
+                cursor.execute(statement, params)
+
+        self.stdout.write(f'{users} usuários, {questions} perguntas, {articles} artigos e '
+                          f'{2 * questions} respostas inseridos')
+
+    def query_shapes(self) -> dict:
+        profile = UserProfile.objects.filter(user__username='benchmark_1').values_list('pk', flat=True).first()
+
+        return {
+            'Perguntas publicadas': Question.objects.filter(is_published=True).order_by('-created_at', '-pk')[:50],
+            'Perguntas sem solução por tecnologia': Question.objects.filter(
+                is_published=True, is_solutioned=False, technologies__name='benchmark-1'
+            ).order_by('-created_at', '-pk')[:50],
+            'Artigos publicados por tecnologia': Article.objects.filter(
+                is_published=True, technologies__name='benchmark-1'
+            ).order_by('-created_at', '-pk')[:50],
+            'Respostas aceitas do autor': UserProfile.objects.filter(pk=profile).annotate(
+                answers_accepted=Count('answer_author', filter=Q(answer_author__is_accepted=True))
+            ),
+        }
+
+    def explain_all(self, title: str) -> dict:
+        self.stdout.write(f'\n=== {title}')
+
+        timings = {}
+        for name, queryset in self.query_shapes().items():
+            plan = queryset.explain(analyze=True)
+            match = EXECUTION_TIME.search(plan)
+            timings[name] = match.group(1) if match else '?'
+            self.stdout.write(f'\n--- {name}\n{plan}')
+
+        return timings
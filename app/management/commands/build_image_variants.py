@@ -0,0 +1,26 @@
+from django.core.management.base import BaseCommand
+from app import images
+from profiles.models import UserProfile
+from profiles.tasks import build_avatar_variants
+from technologies.models import Technology
+from technologies.tasks import build_logo_variants
+
+
+class Command(BaseCommand):
+    help = 'Enfileira a geração das variantes WebP de avatares e logos enviados antes do pipeline de imagens'
+
+    def handle(self, *args, **options):
+        sources = {
+            'UserProfile.avatar': (UserProfile.objects.exclude(avatar='').exclude(avatar=None),
+                                   'avatar', build_avatar_variants),
+            'Technology.logo': (Technology.objects.exclude(logo='').exclude(logo=None),
+                                'logo', build_logo_variants),
+        }
+
+        for name, (queryset, field, build) in sources.items():
+            queued = 0
+            for instance in queryset.iterator():
+                if images.needs_variants(getattr(instance, field), getattr(instance, f'{field}_variants')):
+                    build.delay(instance.pk)
+                    queued += 1
+            self.stdout.write(f'{name}: {queued} imagem(ns) enfileirada(s)')
@@ -0,0 +1,23 @@
+from django.core.management.base import BaseCommand
+from questions.signals import likes_counter as question_likes_counter
+from articles.signals import likes_counter as article_likes_counter
+from answers.signals import upvotes_counter
+from profiles import stats
+
+
+class Command(BaseCommand):
+    help = 'Recalcula likes_count, upvotes_count e as estatísticas dos perfis a partir das tabelas de origem'
+
+    def handle(self, *args, **options):
+        counters = {
+            'Question.likes_count': question_likes_counter,
+            'Article.likes_count': article_likes_counter,
+            'Answer.upvotes_count': upvotes_counter,
+        }
+
+        for name, counter in counters.items():
+            fixed = counter.reconcile()
+            self.stdout.write(f'{name}: {fixed} registro(s) corrigido(s)')
+
+        fixed = stats.reconcile()
+        self.stdout.write(f'ProfileStats: {fixed} registro(s) corrigido(s)')
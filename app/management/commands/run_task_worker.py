@@ -0,0 +1,38 @@
+import signal
+import socket
+from django.core.management.base import BaseCommand
+from django.utils.module_loading import autodiscover_modules
+from app import tasks
+
+
+class Command(BaseCommand):
+    help = 'Processa a fila de tarefas em segundo plano (efeitos colaterais das escritas)'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--name', default=socket.gethostname(),
+            help='Nome único do worker; a lista de processamento dele é recuperada ao iniciar.'
+        )
+        parser.add_argument('--burst', action='store_true', help='Sai quando a fila estiver vazia.')
+        parser.add_argument('--requeue-dead', action='store_true',
+                            help='Devolve as tarefas da dead-letter para a fila e sai.')
+
+    def handle(self, *args, **options):
+        autodiscover_modules('tasks')
+
+        if options['requeue_dead']:
+            requeued = tasks.requeue_dead()
+            self.stdout.write(f'{requeued} tarefa(s) devolvida(s) para a fila')
+            return
+
+        worker = tasks.Worker(options['name'])
+
+        def stop(signum, frame):
+            worker.stopping = True
+
+        if not options['burst']:
+            signal.signal(signal.SIGTERM, stop)
+            signal.signal(signal.SIGINT, stop)
+            self.stdout.write(f'Worker {worker.name} aguardando tarefas')
+
+        worker.run(burst=options['burst'])
@@ -0,0 +1,263 @@
+import base64
+import binascii
+import hashlib
+import json
+from datetime import datetime
+from functools import partial
+from django.conf import settings
+from django.core.cache import caches
+from django.core.paginator import EmptyPage, Paginator
+from django.db import connections
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import PageNumberPagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+
+class CountedPaginator(Paginator):
+    """Paginator with a count computed up front.
+
+    When the count is approximate, page numbers past it are still served
+    and the last page is not trimmed to it.
+    """
+
+    def __init__(self, object_list, per_page, count: int, approximate: bool = False, **kwargs):
+        super().__init__(object_list, per_page, **kwargs)
+        self._count = count
+        self.approximate = approximate
+
+    @property
+    def count(self) -> int:
+        return self._count
+
+    def validate_number(self, number):
+        if not self.approximate:
+            return super().validate_number(number)
+
+        try:
+            return super().validate_number(number)
+        except EmptyPage:
+            number = int(number)
+            if number < 1:
+                raise
+            return number
+
+    def page(self, number):
+        if not self.approximate:
+            return super().page(number)
+
+        number = self.validate_number(number)
+        bottom = (number - 1) * self.per_page
+        return self._get_page(self.object_list[bottom:bottom + self.per_page], number, self)
+
+
+class ApproximateCountPagination(PageNumberPagination):
+    """Page-number pagination that only pays an exact COUNT(*) for small sets.
+
+    The count query is capped at PAGINATION_EXACT_COUNT_THRESHOLD rows. Above
+    that, an unfiltered list reports an exact count cached for
+    PAGINATION_COUNT_CACHE_TTL seconds and a filtered one reports the
+    planner's row estimate. Either way ``count_is_approximate`` is true.
+    """
+
+    count_is_approximate = False
+
+    def paginate_queryset(self, queryset, request, view=None):
+        count, self.count_is_approximate = self.get_count(queryset, view)
+        self.django_paginator_class = partial(CountedPaginator, count=count, approximate=self.count_is_approximate)
+        return super().paginate_queryset(queryset, request, view)
+
+    def get_paginated_response(self, data):
+        return Response({
+            'count': self.page.paginator.count,
+            'count_is_approximate': self.count_is_approximate,
+            'next': self.get_next_link(),
+            'previous': self.get_previous_link(),
+            'results': data,
+        })
+
+    def get_paginated_response_schema(self, schema):
+        response_schema = super().get_paginated_response_schema(schema)
+        response_schema['properties']['count_is_approximate'] = {'type': 'boolean', 'example': False}
+        return response_schema
+
+    def get_next_link(self):
+        if not self.count_is_approximate:
+            return super().get_next_link()
+
+        # The count can be off either way, so a full page is the only sign
+        # that there is another one.
+        if len(self.page) < self.page.paginator.per_page:
+            return None
+
+        url = self.request.build_absolute_uri()
+        return replace_query_param(url, self.page_query_param, self.page.number + 1)
+
+    def get_count(self, queryset, view):
+        threshold = settings.PAGINATION_EXACT_COUNT_THRESHOLD
+        capped = queryset.order_by()[:threshold + 1].count()
+        if capped <= threshold:
+            return capped, False
+
+        if self.is_unfiltered(queryset, view):
+            return cached_count(queryset), True
+
+        return max(estimate_count(queryset), capped), True
+
+    def is_unfiltered(self, queryset, view) -> bool:
+        if view is None:
+            return False
+
+        return str(queryset.query.where) == str(view.get_queryset().query.where)
+
+
+def cached_count(queryset) -> int:
+    cache_view = caches['view_cache']
+    sql = str(queryset.order_by().query)
+    key = f"pagination_count:{hashlib.md5(sql.encode()).hexdigest()}"
+
+    count = cache_view.get(key)
+    if count is None:
+        count = queryset.order_by().count()
+        cache_view.set(key, count, timeout=settings.PAGINATION_COUNT_CACHE_TTL)
+
+    return int(count)
+
+
+def estimate_count(queryset) -> int:
+    sql, params = queryset.order_by().query.sql_with_params()
+    with connections[queryset.db].cursor() as cursor:
+        cursor.execute(f'EXPLAIN (FORMAT JSON) {sql}', params)
+        plan = cursor.fetchone()[0]
+
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+
+    return int(plan[0]['Plan']['Plan Rows'])
+
+
+class KeysetPagination(ApproximateCountPagination):
+    """Approximate-count page-number pagination with an opt-in keyset mode.
+
+    Sending ``?cursor=`` (empty for the first page) switches to keyset
+    pagination on ``(created_at, pk)``, in the direction of the view's
+    default ordering. Each page is a range scan on that pair, so deep pages
+    cost the same as the first one and no COUNT(*) is run. Cursors are
+    opaque and the client ordering is ignored in this mode.
+    """
+
+    cursor_query_param = 'cursor'
+    invalid_cursor_message = 'Cursor inválido.'
+
+    use_keyset = False
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.use_keyset = self.cursor_query_param in request.query_params
+        if not self.use_keyset:
+            return super().paginate_queryset(queryset, request, view)
+
+        self.request = request
+        page_size = self.get_page_size(request)
+        position, reverse = self.decode_cursor(request)
+
+        descending = self.is_descending(view) != reverse
+        if descending:
+            queryset = queryset.order_by('-created_at', '-pk')
+        else:
+            queryset = queryset.order_by('created_at', 'pk')
+
+        if position is not None:
+            queryset = queryset.filter(self.after(position, descending))
+
+        results = list(queryset[:page_size + 1])
+        has_more = len(results) > page_size
+        results = results[:page_size]
+
+        if reverse:
+            results.reverse()
+            self.has_next, self.has_previous = position is not None, has_more
+        else:
+            self.has_next, self.has_previous = has_more, position is not None
+
+        self.page_results = results
+        return results
+
+    def get_paginated_response(self, data):
+        if not self.use_keyset:
+            return super().get_paginated_response(data)
+
+        return Response({
+            'next': self.get_next_link(),
+            'previous': self.get_previous_link(),
+            'results': data,
+        })
+
+    def get_next_link(self):
+        if not self.use_keyset:
+            return super().get_next_link()
+
+        if not self.has_next or not self.page_results:
+            return None
+
+        return self.build_cursor_link(self.page_results[-1], reverse=False)
+
+    def get_previous_link(self):
+        if not self.use_keyset:
+            return super().get_previous_link()
+
+        if not self.has_previous or not self.page_results:
+            return None
+
+        return self.build_cursor_link(self.page_results[0], reverse=True)
+
+    def get_schema_operation_parameters(self, view):
+        parameters = super().get_schema_operation_parameters(view)
+        parameters.append({
+            'name': self.cursor_query_param,
+            'required': False,
+            'in': 'query',
+            'description': 'Cursor da paginação por keyset. Envie vazio para a primeira página.',
+            'schema': {'type': 'string'},
+        })
+        return parameters
+
+    def is_descending(self, view) -> bool:
+        ordering = getattr(view, 'ordering', None) or ['-created_at']
+        if isinstance(ordering, str):
+            ordering = [ordering]
+
+        return ordering[0].startswith('-')
+
+    def after(self, position, descending: bool) -> Q:
+        created_at, pk = position
+        lookup, bound = ('lt', 'lte') if descending else ('gt', 'gte')
+
+        # The redundant bound on created_at lets Postgres use it as an index
+        # condition on (created_at, id) instead of filtering row by row.
+        return Q(**{f'created_at__{bound}': created_at}) & (
+            Q(**{f'created_at__{lookup}': created_at}) | Q(**{f'pk__{lookup}': pk})
+        )
+
+    def build_cursor_link(self, instance, reverse: bool) -> str:
+        payload = {'c': instance.created_at.isoformat(), 'p': instance.pk}
+        if reverse:
+            payload['r'] = 1
+
+        cursor = base64.urlsafe_b64encode(json.dumps(payload, separators=(',', ':')).encode()).decode()
+        url = remove_query_param(self.request.build_absolute_uri(), self.page_query_param)
+        return replace_query_param(url, self.cursor_query_param, cursor)
+
+    def decode_cursor(self, request):
+        encoded = request.query_params.get(self.cursor_query_param, '').strip()
+        if not encoded:
+            return None, False
+
+        try:
+            payload = json.loads(base64.urlsafe_b64decode(encoded.encode()))
+            position = (datetime.fromisoformat(payload['c']), int(payload['p']))
+            reverse = bool(payload.get('r'))
+        except (TypeError, ValueError, KeyError, binascii.Error):
+            raise NotFound(self.invalid_cursor_message)
+
+        return position, reverse
@@ -0,0 +1,111 @@
+import hashlib
+import random
+from contextlib import contextmanager
+from contextvars import ContextVar
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.core.cache import caches
+from django.db import DEFAULT_DB_ALIAS
+
+
+SAFE_METHODS = ('GET', 'HEAD', 'OPTIONS')
+
+_replica_reads = ContextVar('replica_reads', default=False)
+
+
+class PrimaryReplicaRouter:
+    """Sends reads to a random DATABASE_REPLICAS alias, but only while
+    ReplicaRoutingMiddleware allows it for the current request. Everything
+    else, including management commands, stays on the primary."""
+
+    def db_for_read(self, model, **hints):
+        replicas = settings.DATABASE_REPLICAS
+        if replicas and _replica_reads.get():
+            return random.choice(replicas)
+
+        return DEFAULT_DB_ALIAS
+
+    def db_for_write(self, model, **hints):
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        # Replicas get their schema from the primary.
+        return db not in settings.DATABASE_REPLICAS
+
+
+class ReplicaRoutingMiddleware:
+    """Enables replica reads for safe requests.
+
+    After a write, requests carrying the same Authorization header keep
+    reading from the primary for DB_REPLICA_STICKY_SECONDS, so clients see
+    their own writes despite replication lag.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+
+        if not settings.DATABASE_REPLICAS:
+            return self.get_response(request)
+
+        safe = request.method in SAFE_METHODS
+        key = pin_key(request)
+
+        token = _replica_reads.set(safe and not (key and caches['default'].get(key)))
+        try:
+            response = self.get_response(request)
+        finally:
+            _replica_reads.reset(token)
+
+        if not safe and key:
+            caches['default'].set(key, 1, timeout=settings.DB_REPLICA_STICKY_SECONDS)
+
+        return response
+
+    async def __acall__(self, request):
+        if not settings.DATABASE_REPLICAS:
+            return await self.get_response(request)
+
+        safe = request.method in SAFE_METHODS
+        key = pin_key(request)
+
+        token = _replica_reads.set(safe and not (key and await caches['default'].aget(key)))
+        try:
+            response = await self.get_response(request)
+        finally:
+            _replica_reads.reset(token)
+
+        if not safe and key:
+            await caches['default'].aset(key, 1, timeout=settings.DB_REPLICA_STICKY_SECONDS)
+
+        return response
+
+
+@contextmanager
+def primary_reads():
+    """Keeps the reads inside the block on the primary, even during a
+    request that may use replicas."""
+    token = _replica_reads.set(False)
+    try:
+        yield
+    finally:
+        _replica_reads.reset(token)
+
+
+def pin_key(request):
+    authorization = request.headers.get('Authorization')
+    if not authorization:
+        return None
+
+    return f"db_primary_pin:{hashlib.sha256(authorization.encode()).hexdigest()}"
@@ -0,0 +1,49 @@
+from django.contrib.postgres.search import SearchQuery, SearchRank, SearchVector, SearchVectorField
+from django.db import models
+from django.db.models import F
+from rest_framework.filters import SearchFilter
+
+
+SEARCH_CONFIG = 'portuguese'
+
+
+def search_vector_field() -> models.GeneratedField:
+    """tsvector column kept up to date by Postgres itself, with the title
+    weighted above the content."""
+    return models.GeneratedField(
+        expression=(
+            SearchVector('title', weight='A', config=SEARCH_CONFIG)
+            + SearchVector('content', weight='B', config=SEARCH_CONFIG)
+        ),
+        output_field=SearchVectorField(),
+        db_persist=True,
+    )
+
+
+class FullTextSearchFilter(SearchFilter):
+    """Drop-in replacement for SearchFilter backed by the view model's
+    ``search_vector`` column and its GIN index.
+
+    Results are ranked with ts_rank unless the client asked for an explicit
+    ordering, so it must come after OrderingFilter in ``filter_backends``.
+    """
+
+    search_vector_field = 'search_vector'
+
+    def filter_queryset(self, request, queryset, view):
+        search_terms = self.get_search_terms(request)
+        if not search_terms:
+            return queryset
+
+        query = SearchQuery(' '.join(search_terms), config=SEARCH_CONFIG, search_type='websearch')
+        field = getattr(view, 'search_vector_field', self.search_vector_field)
+
+        queryset = queryset.filter(**{field: query}).annotate(
+            search_rank=SearchRank(F(field), query)
+        )
+
+        ordering_param = getattr(view, 'ordering_param', None) or 'ordering'
+        if not request.query_params.get(ordering_param):
+            queryset = queryset.order_by('-search_rank', *queryset.query.order_by)
+
+        return queryset
@@ -13,7 +13,7 @@ import sys
 import os
 from datetime import timedelta
 from pathlib import Path
-from decouple import config
+from decouple import config, Csv
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent
@@ -40,10 +40,12 @@ INSTALLED_APPS = [
     'django.contrib.sessions',
     'django.contrib.messages',
     'django.contrib.staticfiles',
+    'django.contrib.postgres',
     'rest_framework',
     'rest_framework_simplejwt',
     'django_filters',
     'drf_spectacular',
+    'app',
     'profiles',
     'articles',
     'technologies',
@@ -56,10 +58,12 @@ INSTALLED_APPS = [
 
 MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
+    'app.cache.CacheInvalidationMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'app.replicas.ReplicaRoutingMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
@@ -87,6 +91,12 @@ WSGI_APPLICATION = 'app.wsgi.application'
 # Database
 # https://docs.djangoproject.com/en/5.2/ref/settings/#databases
 
+# With DB_POOL each process keeps a psycopg pool; otherwise every thread
+# keeps its own connection open for DB_CONN_MAX_AGE seconds. The two are
+# mutually exclusive. The pool is the default because it is also safe under
+# ASGI, where app.asgi forces DB_CONN_MAX_AGE to 0.
+DB_POOL = config('DB_POOL', default=True, cast=bool)
+
 DATABASES = {
     'default': {
         'ENGINE': 'django.db.backends.postgresql',
@@ -95,9 +105,38 @@ DATABASES = {
         'PASSWORD': config('DB_PASSWORD'),
         'HOST': config('DB_HOST'),
         'PORT': config('DB_PORT', cast=int),
+        'CONN_MAX_AGE': 0 if DB_POOL else config('DB_CONN_MAX_AGE', default=60, cast=int),
+        'CONN_HEALTH_CHECKS': config('DB_CONN_HEALTH_CHECKS', default=True, cast=bool),
+        'OPTIONS': {
+            'pool': {
+                'min_size': config('DB_POOL_MIN_SIZE', default=2, cast=int),
+                'max_size': config('DB_POOL_MAX_SIZE', default=10, cast=int),
+                'max_lifetime': config('DB_POOL_MAX_LIFETIME', default=1800, cast=float),
+                'max_idle': config('DB_POOL_MAX_IDLE', default=300, cast=float),
+                'timeout': config('DB_POOL_TIMEOUT', default=10, cast=float),
+            },
+        } if DB_POOL else {},
     }
 }
 
+# Read replicas as host[:port], sharing name and credentials with the
+# primary. Under tests they mirror the primary.
+DATABASE_REPLICAS = []
+for index, address in enumerate(config('DB_REPLICAS', default='', cast=Csv()), start=1):
+    host, _, port = address.partition(':')
+    alias = f'replica_{index}'
+    DATABASES[alias] = {
+        **DATABASES['default'],
+        'HOST': host,
+        'PORT': int(port) if port else DATABASES['default']['PORT'],
+        'OPTIONS': dict(DATABASES['default']['OPTIONS']),
+        'TEST': {'MIRROR': 'default'},
+    }
+    DATABASE_REPLICAS.append(alias)
+
+DATABASE_ROUTERS = ['app.replicas.PrimaryReplicaRouter']
+DB_REPLICA_STICKY_SECONDS = config('DB_REPLICA_STICKY_SECONDS', default=5, cast=int)
+
 
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
@@ -145,6 +184,9 @@ IS_TESTING = 'test' in sys.argv
 MEDIA_ROOT = os.path.join(BASE_DIR, 'media')
 MEDIA_URL = '/media/'
 
+# WebP quality of the avatar and logo variants built by app.images.
+IMAGE_VARIANT_QUALITY = config('IMAGE_VARIANT_QUALITY', default=80, cast=int)
+
 CACHES = {
     "default": {
         "BACKEND": "django_redis.cache.RedisCache",
@@ -165,10 +207,31 @@ CACHES = {
 }
 
 CACHE_TTL = config('CACHE_TTL', default=60 * 5, cast=int)
+VIEW_CACHE_TTL_JITTER = config('VIEW_CACHE_TTL_JITTER', default=0.1, cast=float)
+VIEW_CACHE_STALE_GRACE = config('VIEW_CACHE_STALE_GRACE', default=30, cast=int)
+VIEW_CACHE_LOCK_TIMEOUT = config('VIEW_CACHE_LOCK_TIMEOUT', default=10, cast=int)
+VIEW_CACHE_LOCK_WAIT = config('VIEW_CACHE_LOCK_WAIT', default=1.0, cast=float)
+VIEW_CACHE_COMPRESS = config('VIEW_CACHE_COMPRESS', default=True, cast=bool)
+VIEW_CACHE_COMPRESS_MIN_BYTES = config('VIEW_CACHE_COMPRESS_MIN_BYTES', default=1024, cast=int)
+
+VIEW_CACHE_LOCAL_ENABLED = config('VIEW_CACHE_LOCAL_ENABLED', default=False, cast=bool)
+VIEW_CACHE_LOCAL_MAX_ENTRIES = config('VIEW_CACHE_LOCAL_MAX_ENTRIES', default=500, cast=int)
+VIEW_CACHE_LOCAL_MAX_BYTES = config('VIEW_CACHE_LOCAL_MAX_BYTES', default=32 * 1024 * 1024, cast=int)
+VIEW_CACHE_LOCAL_TTL = config('VIEW_CACHE_LOCAL_TTL', default=30, cast=int)
+
+PAGINATION_EXACT_COUNT_THRESHOLD = config('PAGINATION_EXACT_COUNT_THRESHOLD', default=1000, cast=int)
+PAGINATION_COUNT_CACHE_TTL = config('PAGINATION_COUNT_CACHE_TTL', default=60, cast=int)
+
+# Side effects of writes run in `manage.py run_task_worker`; eager mode runs
+# them inline, which is what the test suite expects.
+TASKS_ALWAYS_EAGER = config('TASKS_ALWAYS_EAGER', default=IS_TESTING, cast=bool)
+TASKS_MAX_RETRIES = config('TASKS_MAX_RETRIES', default=5, cast=int)
+TASKS_RETRY_BACKOFF = config('TASKS_RETRY_BACKOFF', default=2.0, cast=float)
+TASKS_POLL_TIMEOUT = config('TASKS_POLL_TIMEOUT', default=5, cast=int)
 
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': (
-        'rest_framework_simplejwt.authentication.JWTStatelessUserAuthentication',
+        'authentication.authentication.RevocableJWTStatelessUserAuthentication',
     ),
     'DEFAULT_FILTER_BACKENDS': [
         'django_filters.rest_framework.DjangoFilterBackend',
@@ -188,6 +251,11 @@ SIMPLE_JWT = {
     "ROTATE_REFRESH_TOKENS": True,
 }
 
+# Per-worker Bloom filter of revoked token ids; only probable hits are
+# confirmed in Redis.
+TOKEN_REVOCATION_FILTER_CAPACITY = config('TOKEN_REVOCATION_FILTER_CAPACITY', default=100_000, cast=int)
+TOKEN_REVOCATION_FILTER_ERROR_RATE = config('TOKEN_REVOCATION_FILTER_ERROR_RATE', default=0.001, cast=float)
+
 SPECTACULAR_SETTINGS = {
     'TITLE': 'Central Junior API',
     'DESCRIPTION': 'API documentation for our app',
@@ -0,0 +1,160 @@
+import json
+import logging
+import time
+import uuid
+from contextvars import ContextVar
+from functools import partial
+from django.conf import settings
+from django.db import close_old_connections, transaction
+from django_redis import get_redis_connection
+
+
+QUEUE_KEY = 'tasks:queue'
+DELAYED_KEY = 'tasks:delayed'
+DEAD_KEY = 'tasks:dead'
+
+logger = logging.getLogger(__name__)
+
+registry = {}
+
+_current_task_id = ContextVar('current_task_id', default=None)
+
+
+def current_task_id() -> str | None:
+    """Id of the message being run. Retries and redeliveries of a message
+    keep its id, so tasks can use it to skip work already done."""
+    return _current_task_id.get()
+
+
+class Task:
+    """A function that runs in the task worker. Arguments must be JSON
+    serializable; ``delay`` enqueues once the current transaction commits."""
+
+    def __init__(self, function):
+        self.function = function
+        self.name = f'{function.__module__}.{function.__name__}'
+        registry[self.name] = self
+
+    def __call__(self, *args, **kwargs):
+        return self.function(*args, **kwargs)
+
+    def run(self, message: dict):
+        token = _current_task_id.set(message['id'])
+        try:
+            return self(*message['args'], **message['kwargs'])
+        finally:
+            _current_task_id.reset(token)
+
+    def delay(self, *args, **kwargs):
+        message = {
+            'id': uuid.uuid4().hex,
+            'task': self.name,
+            'args': args,
+            'kwargs': kwargs,
+            'attempts': 0,
+        }
+        # Round-tripped in eager mode too, so tests catch arguments the
+        # worker could not receive.
+        payload = json.dumps(message)
+
+        if settings.TASKS_ALWAYS_EAGER:
+            self.run(json.loads(payload))
+            return
+
+        transaction.on_commit(partial(push, QUEUE_KEY, payload))
+
+
+def task(function) -> Task:
+    return Task(function)
+
+
+def redis():
+    return get_redis_connection('default')
+
+
+def push(key: str, payload: str):
+    redis().lpush(key, payload)
+
+
+class Worker:
+    """Reliable Redis-list consumer.
+
+    Each message is moved atomically to this worker's processing list while
+    it runs, so a crash leaves it there to be requeued on the next start.
+    Failures are retried with exponential backoff through a sorted set and
+    end up in the dead-letter list after TASKS_MAX_RETRIES retries.
+    """
+
+    def __init__(self, name: str = 'default'):
+        self.name = name
+        self.processing_key = f'tasks:processing:{name}'
+        self.redis = redis()
+        self.stopping = False
+
+    def run(self, burst: bool = False):
+        self.requeue_processing()
+
+        while not self.stopping:
+            self.promote_due_retries()
+
+            if burst:
+                payload = self.redis.lmove(QUEUE_KEY, self.processing_key, 'RIGHT', 'LEFT')
+                if payload is None:
+                    return
+            else:
+                payload = self.redis.blmove(
+                    QUEUE_KEY, self.processing_key, settings.TASKS_POLL_TIMEOUT, 'RIGHT', 'LEFT'
+                )
+                if payload is None:
+                    continue
+
+            self.process(payload)
+
+    def process(self, payload):
+        message = json.loads(payload)
+        try:
+            registry[message['task']].run(message)
+        except Exception as error:
+            logger.exception('Task %s (%s) failed', message['task'], message['id'])
+            self.fail(message, error)
+        finally:
+            self.redis.lrem(self.processing_key, 1, payload)
+            close_old_connections()
+
+    def fail(self, message: dict, error: Exception):
+        message = {**message, 'attempts': message['attempts'] + 1, 'error': repr(error)}
+
+        if message['task'] not in registry or message['attempts'] > settings.TASKS_MAX_RETRIES:
+            message['failed_at'] = int(time.time())
+            self.redis.lpush(DEAD_KEY, json.dumps(message))
+            return
+
+        retry_at = time.time() + settings.TASKS_RETRY_BACKOFF * 2 ** (message['attempts'] - 1)
+        self.redis.zadd(DELAYED_KEY, {json.dumps(message): retry_at})
+
+    def promote_due_retries(self):
+        for payload in self.redis.zrangebyscore(DELAYED_KEY, 0, time.time()):
+            # Only the worker that removes the entry requeues it.
+            if self.redis.zrem(DELAYED_KEY, payload):
+                self.redis.lpush(QUEUE_KEY, payload)
+
+    def requeue_processing(self):
+        while self.redis.lmove(self.processing_key, QUEUE_KEY, 'RIGHT', 'RIGHT') is not None:
+            pass
+
+
+def requeue_dead() -> int:
+    """Moves every dead-letter message back to the queue with its attempts
+    reset."""
+    connection = redis()
+    requeued = 0
+
+    while (payload := connection.rpop(DEAD_KEY)) is not None:
+        message = json.loads(payload)
+        message.update(attempts=0)
+        message.pop('error', None)
+        message.pop('failed_at', None)
+        connection.lpush(QUEUE_KEY, json.dumps(message))
+        requeued += 1
+
+    return requeued
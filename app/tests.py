@@ -0,0 +1,628 @@
+import gzip
+import json
+import os
+import subprocess
+import sys
+import threading
+import time
+from io import StringIO
+from unittest import mock
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.cache import caches
+from django.core.management import call_command
+from django.db import DEFAULT_DB_ALIAS, connections, transaction
+from django.http import HttpResponse
+from asgiref.sync import iscoroutinefunction
+from django.test import RequestFactory, SimpleTestCase, TestCase, TransactionTestCase, override_settings
+from django.test.client import AsyncClientHandler
+from django.urls import resolve, reverse
+from django_redis import get_redis_connection
+from rest_framework import status
+from rest_framework.permissions import AllowAny
+from rest_framework.response import Response
+from rest_framework.test import APIRequestFactory, APITestCase
+from rest_framework.views import APIView
+from rest_framework_simplejwt.tokens import AccessToken
+from app import tasks
+from app import cache as app_cache
+from app.async_views import AsyncViewResolverMixin
+from app.cache import CacheInvalidationMiddleware, ViewCacheEntry, bump_namespace, namespace_version
+from app.local_cache import LocalCache, InvalidationListener, INVALIDATION_CHANNEL
+from profiles.models import UserProfile, ReputationEvent
+from profiles.tasks import award_reputation
+from articles.models import Article
+from questions.models import Question
+from questions.views import QuestionListCreateView
+from technologies.models import Technology
+
+
+class LocalCacheTestCase(SimpleTestCase):
+
+    def setUp(self) -> None:
+        self.cache = LocalCache(max_entries=3, max_bytes=10_000, ttl=30)
+
+    def test_returns_stored_value(self):
+        self.cache.set('question_detail_1', {'title': 'Django'}, ['question_1'], self.cache.sequence)
+
+        self.assertEqual(self.cache.get('question_detail_1'), {'title': 'Django'})
+
+    def test_evicts_least_recently_used_entry(self):
+        for pk in range(3):
+            self.cache.set(f'question_detail_{pk}', pk, [f'question_{pk}'], self.cache.sequence)
+
+        self.cache.get('question_detail_0')
+        self.cache.set('question_detail_3', 3, ['question_3'], self.cache.sequence)
+
+        self.assertEqual(len(self.cache), 3)
+        self.assertIsNone(self.cache.get('question_detail_1'))
+        self.assertEqual(self.cache.get('question_detail_0'), 0)
+
+    def test_respects_memory_cap(self):
+        cache = LocalCache(max_entries=100, max_bytes=2_500, ttl=30)
+
+        for pk in range(5):
+            cache.set(f'article_detail_{pk}', 'x' * 1_000, [f'article_{pk}'], cache.sequence)
+
+        self.assertLessEqual(cache.size, 2_500)
+        self.assertEqual(len(cache), 2)
+
+        cache.set('article_detail_big', 'x' * 5_000, ['article_big'], cache.sequence)
+        self.assertIsNone(cache.get('article_detail_big'))
+
+    def test_expired_entries_are_not_returned(self):
+        self.cache.set('question_detail_1', 1, ['question_1'], self.cache.sequence)
+
+        with mock.patch('app.local_cache.time.monotonic', return_value=time.monotonic() + 31):
+            self.assertIsNone(self.cache.get('question_detail_1'))
+
+        self.assertEqual(len(self.cache), 0)
+
+    def test_invalidate_drops_every_entry_of_namespace(self):
+        self.cache.set('question_detail_1', 1, ['question_1'], self.cache.sequence)
+        self.cache.set('answers_question_list_1', [], ['question_1'], self.cache.sequence)
+        self.cache.set('question_detail_2', 2, ['question_2'], self.cache.sequence)
+
+        self.cache.invalidate('question_1')
+
+        self.assertIsNone(self.cache.get('question_detail_1'))
+        self.assertIsNone(self.cache.get('answers_question_list_1'))
+        self.assertEqual(self.cache.get('question_detail_2'), 2)
+
+    def test_value_read_before_an_invalidation_is_not_stored(self):
+        sequence = self.cache.sequence
+        self.cache.invalidate('question_1')
+
+        self.cache.set('question_detail_1', 'stale', ['question_1'], sequence)
+
+        self.assertIsNone(self.cache.get('question_detail_1'))
+
+
+class InvalidationListenerTestCase(SimpleTestCase):
+
+    def test_drops_entries_when_invalidation_is_published(self):
+        cache = LocalCache(max_entries=10, max_bytes=10_000, ttl=30)
+        listener = InvalidationListener(cache)
+        listener.start()
+        self.assertTrue(listener.connected.wait(timeout=5))
+
+        cache.set('profile_detail_1', {'bio': 'dev'}, ['profile_1'], cache.sequence)
+        get_redis_connection('view_cache').publish(INVALIDATION_CHANNEL, 'profile_1\nprofile_2')
+
+        deadline = time.monotonic() + 5
+        while cache.get('profile_detail_1') is not None and time.monotonic() < deadline:
+            time.sleep(0.01)
+
+        self.assertIsNone(cache.get('profile_detail_1'))
+
+
+class CachedDetailView(APIView):
+    build = None
+    permission_classes = [AllowAny]
+
+    def get(self, request, *args, **kwargs):
+        return ViewCacheEntry('question_detail_1', 'question_1').get_or_build(self.build, request, *args, **kwargs)
+
+
+class ViewCacheEntryTestCase(SimpleTestCase):
+
+    def setUp(self) -> None:
+        caches['view_cache'].clear()
+        self.factory = APIRequestFactory()
+        self.build = mock.Mock(return_value=Response({'title': 'novo'}, status=status.HTTP_200_OK))
+        self.view = CachedDetailView.as_view(build=self.build)
+
+    def tearDown(self) -> None:
+        caches['view_cache'].clear()
+
+    def get(self, **headers):
+        return self.view(self.factory.get('/', **headers))
+
+    def test_miss_builds_and_stores_rendered_body(self):
+        response = self.get()
+
+        self.assertEqual(json.loads(response.content), {'title': 'novo'})
+        self.assertEqual(json.loads(ViewCacheEntry('question_detail_1', 'question_1').get()), {'title': 'novo'})
+
+        response = self.get()
+        self.assertEqual(json.loads(response.content), {'title': 'novo'})
+        self.assertEqual(response['Content-Type'], 'application/json')
+        self.build.assert_called_once()
+
+    def test_large_bodies_are_stored_gzipped(self):
+        self.build.return_value = Response({'content': 'x' * 5_000}, status=status.HTTP_200_OK)
+        self.get()
+
+        cache_entry = ViewCacheEntry('question_detail_1', 'question_1')
+        envelope = caches['view_cache'].get(cache_entry.key)
+        self.assertEqual(envelope['encoding'], 'gzip')
+        self.assertLess(len(envelope['body']), 5_000)
+
+        compressed = self.get(HTTP_ACCEPT_ENCODING='gzip, deflate')
+        self.assertEqual(compressed['Content-Encoding'], 'gzip')
+        self.assertEqual(json.loads(gzip.decompress(compressed.content))['content'], 'x' * 5_000)
+
+        plain = self.get()
+        self.assertFalse(plain.has_header('Content-Encoding'))
+        self.assertEqual(json.loads(plain.content)['content'], 'x' * 5_000)
+        self.assertNotEqual(plain['ETag'], compressed['ETag'])
+        self.build.assert_called_once()
+
+    def test_browsable_api_is_not_cached(self):
+        self.get(HTTP_ACCEPT='text/html')
+
+        self.assertIsNone(ViewCacheEntry('question_detail_1', 'question_1').get())
+
+    def test_error_responses_are_not_stored(self):
+        self.build.return_value = Response({'detail': 'x'}, status=status.HTTP_404_NOT_FOUND)
+
+        response = self.get()
+
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+        self.assertIsNone(ViewCacheEntry('question_detail_1', 'question_1').get())
+
+    def test_stale_value_is_served_while_another_worker_rebuilds(self):
+        cache_entry = ViewCacheEntry('question_detail_1', 'question_1')
+        with mock.patch('app.cache.time.time', return_value=time.time() - settings.CACHE_TTL * 2):
+            cache_entry.set(b'{"title":"antigo"}', 'application/json')
+
+        lock = caches['view_cache'].lock(f"{cache_entry.key}:lock", timeout=5)
+        self.assertTrue(lock.acquire(blocking=False))
+        try:
+            response = self.get()
+        finally:
+            lock.release()
+
+        self.assertEqual(json.loads(response.content), {'title': 'antigo'})
+        self.build.assert_not_called()
+
+    def test_stale_value_is_rebuilt_by_lock_owner(self):
+        cache_entry = ViewCacheEntry('question_detail_1', 'question_1')
+        with mock.patch('app.cache.time.time', return_value=time.time() - settings.CACHE_TTL * 2):
+            cache_entry.set(b'{"title":"antigo"}', 'application/json')
+
+        response = self.get()
+
+        self.assertEqual(json.loads(response.content), {'title': 'novo'})
+        self.build.assert_called_once()
+
+    def test_miss_waits_for_the_worker_holding_the_lock(self):
+        cache_entry = ViewCacheEntry('question_detail_1', 'question_1')
+        # Released by the filler thread, so the token is not thread-local.
+        lock = caches['view_cache'].lock(f"{cache_entry.key}:lock", timeout=5, thread_local=False)
+        self.assertTrue(lock.acquire(blocking=False))
+
+        def fill():
+            time.sleep(0.2)
+            cache_entry.set(b'{"title":"preenchido"}', 'application/json')
+            lock.release()
+
+        filler = threading.Thread(target=fill)
+        filler.start()
+        response = self.get()
+        filler.join()
+
+        self.assertEqual(json.loads(response.content), {'title': 'preenchido'})
+        self.build.assert_not_called()
+
+    @override_settings(VIEW_CACHE_TTL_JITTER=0.5)
+    def test_ttl_gets_jitter(self):
+        cache_entry = ViewCacheEntry('question_detail_1', 'question_1')
+        ttls = set()
+        for _ in range(20):
+            cache_entry.set(b'{"title":"novo"}', 'application/json')
+            ttls.add(caches['view_cache'].ttl(cache_entry.key))
+
+        self.assertGreater(len(ttls), 1)
+        for ttl in ttls:
+            self.assertGreaterEqual(ttl, settings.CACHE_TTL)
+            self.assertLessEqual(ttl, settings.CACHE_TTL * 1.5 + settings.VIEW_CACHE_STALE_GRACE)
+
+
+class BenchmarkListIndexesTestCase(TestCase):
+
+    def test_reports_both_plans_and_rolls_back_the_dataset(self):
+        out = StringIO()
+
+        call_command('benchmark_list_indexes', users=5, questions=50, articles=10, stdout=out)
+
+        self.assertIn('Antes (sem os índices de listagem)', out.getvalue())
+        self.assertIn('Perguntas sem solução por tecnologia', out.getvalue())
+        self.assertFalse(Question.objects.exists())
+
+
+class BenchmarkAsyncReadsTestCase(TransactionTestCase):
+
+    def tearDown(self) -> None:
+        caches['view_cache'].clear()
+
+    def test_reports_wsgi_and_asgi_throughput(self):
+        out = StringIO()
+
+        call_command('benchmark_async_reads', requests=20, concurrency=2, stdout=out)
+
+        self.assertIn('WSGI (2 threads)', out.getvalue())
+        self.assertIn('ASGI (1 event loop)', out.getvalue())
+
+
+class BenchmarkDbConnectionsTestCase(TransactionTestCase):
+
+    def test_reports_every_mode_and_restores_the_settings(self):
+        settings_dict = connections.settings[DEFAULT_DB_ALIAS]
+        original = (settings_dict['CONN_MAX_AGE'], settings_dict['OPTIONS'])
+        out = StringIO()
+
+        call_command('benchmark_db_connections', requests=20, threads=2, stdout=out)
+
+        self.assertIn('Sem persistência', out.getvalue())
+        self.assertIn('Conexões persistentes', out.getvalue())
+        self.assertIn('Pool do psycopg', out.getvalue())
+        self.assertEqual((settings_dict['CONN_MAX_AGE'], settings_dict['OPTIONS']), original)
+
+
+class AsgiEntrypointTestCase(SimpleTestCase):
+
+    def test_persistent_connections_are_disabled_under_asgi(self):
+        code = (
+            'import app.asgi\n'
+            'from django.conf import settings\n'
+            "print(settings.DATABASES['default']['CONN_MAX_AGE'])"
+        )
+        env = {**os.environ, 'DB_POOL': 'False', 'DB_CONN_MAX_AGE': '60'}
+
+        output = subprocess.run(
+            [sys.executable, '-c', code], env=env, cwd=settings.BASE_DIR,
+            capture_output=True, text=True, check=True
+        ).stdout
+
+        self.assertEqual(output.strip(), '0')
+
+
+@override_settings(DATABASE_REPLICAS=['replica_test'])
+class ReplicaRoutingTestCase(APITestCase):
+    """Runs against a second, unreplicated Postgres database standing in for
+    the replica, so every read shows which database answered it."""
+
+    @classmethod
+    def setUpClass(cls):
+        primary = connections.settings[DEFAULT_DB_ALIAS]
+        cls.replica_name = f"{primary['NAME']}_replica"
+
+        cls.run_on_primary('DROP DATABASE IF EXISTS {}')
+        cls.run_on_primary('CREATE DATABASE {}')
+        connections.settings['replica_test'] = {**primary, 'NAME': cls.replica_name}
+
+        with override_settings(DATABASE_REPLICAS=[]):
+            call_command('migrate', database='replica_test', verbosity=0)
+
+        # Set here: the test runner only sets up aliases found in settings.
+        cls.databases = {DEFAULT_DB_ALIAS, 'replica_test'}
+        super().setUpClass()
+
+    @classmethod
+    def tearDownClass(cls):
+        super().tearDownClass()
+
+        connections['replica_test'].close()
+        # With DB_POOL the pooled connections would keep the database in use.
+        connections['replica_test'].close_pool()
+        del connections['replica_test']
+        del connections.settings['replica_test']
+        cls.run_on_primary('DROP DATABASE IF EXISTS {}')
+
+    @classmethod
+    def run_on_primary(cls, sql: str):
+        connection = connections[DEFAULT_DB_ALIAS]
+        with connection.cursor() as cursor:
+            cursor.execute(sql.format(connection.ops.quote_name(cls.replica_name)))
+
+    def setUp(self) -> None:
+        caches['default'].clear()
+
+        self.admin = User.objects.create_superuser(username='admin1', password='1234', email='admin@gmail.com')
+        self.client.force_authenticate(user=self.admin)
+
+        self.technology = Technology.objects.create(name='Django', slug='django')
+        Technology.objects.using('replica_test').create(pk=self.technology.pk, name='Django (réplica)', slug='django')
+
+        self.url = reverse('technology-detail', kwargs={'pk': self.technology.pk})
+        self.authorization = f'Bearer {AccessToken.for_user(self.admin)}'
+
+    def tearDown(self) -> None:
+        caches['default'].clear()
+
+    def test_safe_requests_read_from_the_replica(self):
+        response = self.client.get(self.url, HTTP_AUTHORIZATION=self.authorization)
+
+        self.assertEqual(response.json()['name'], 'Django (réplica)')
+
+    def test_reads_stick_to_the_primary_after_a_write(self):
+        data = {'name': 'Django 5', 'slug': 'django', 'color': '#5e6e7d', 'prism_lang': 'python'}
+        response = self.client.put(self.url, data, HTTP_AUTHORIZATION=self.authorization)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        response = self.client.get(self.url, HTTP_AUTHORIZATION=self.authorization)
+        self.assertEqual(response.json()['name'], 'Django 5')
+
+        other_user = User.objects.create_user(username='test1', password='1234')
+        response = self.client.get(self.url, HTTP_AUTHORIZATION=f'Bearer {AccessToken.for_user(other_user)}')
+        self.assertEqual(response.json()['name'], 'Django (réplica)')
+
+    def test_cache_misses_right_after_a_bump_are_built_on_the_primary(self):
+        caches['view_cache'].clear()
+        self.addCleanup(caches['view_cache'].clear)
+        profile = UserProfile.objects.create(user=self.admin, bio='test', expertise='django')
+        Question.objects.create(title='Só no primário', content='Conteúdo', profile=profile)
+
+        response = self.client.get(reverse('create-question'), HTTP_AUTHORIZATION=self.authorization)
+
+        self.assertEqual([item['title'] for item in response.json()['results']], ['Só no primário'])
+
+    def test_other_cache_misses_are_built_on_the_replica(self):
+        profile = UserProfile.objects.create(user=self.admin, bio='test', expertise='django')
+        Question.objects.create(title='Só no primário', content='Conteúdo', profile=profile)
+        # Drops the record of the bump along with the cached entries.
+        caches['view_cache'].clear()
+        self.addCleanup(caches['view_cache'].clear)
+
+        response = self.client.get(reverse('create-question'), HTTP_AUTHORIZATION=self.authorization)
+
+        self.assertEqual(response.json()['results'], [])
+
+    def test_reads_outside_requests_use_the_primary(self):
+        self.assertEqual(Technology.objects.get(pk=self.technology.pk).name, 'Django')
+
+
+class AsyncReadClientHandler(AsyncViewResolverMixin, AsyncClientHandler):
+    pass
+
+
+class AsyncReadViewTestCase(TestCase):
+
+    def setUp(self) -> None:
+        caches['view_cache'].clear()
+        # The test client's handler, resolving views like AsyncReadASGIHandler.
+        self.async_client.handler = AsyncReadClientHandler()
+
+        self.user = User.objects.create_user(username='test1', password='1234', email='test@gmail.com')
+        profile = UserProfile.objects.create(user=self.user, bio='test', expertise='django')
+        Question.objects.create(title='Como usar async no Django?', content='Conteúdo', profile=profile)
+        self.technology = Technology.objects.create(name='Django', slug='django')
+
+        self.authorization = f'Bearer {AccessToken.for_user(self.user)}'
+
+    def tearDown(self) -> None:
+        caches['view_cache'].clear()
+
+    def test_wsgi_requests_resolve_to_the_sync_view(self):
+        view = resolve(reverse('create-question')).func
+
+        self.assertFalse(iscoroutinefunction(view))
+        self.assertTrue(iscoroutinefunction(view.async_view))
+
+    async def test_cache_hits_do_not_reach_the_sync_view(self):
+        url = reverse('create-question')
+        miss = await self.async_client.get(url)
+        self.assertEqual(miss.status_code, status.HTTP_200_OK)
+
+        with mock.patch.object(QuestionListCreateView, 'list') as sync_list:
+            hit = await self.async_client.get(url)
+
+        sync_list.assert_not_called()
+        self.assertEqual(hit.status_code, status.HTTP_200_OK)
+        self.assertEqual(hit.content, miss.content)
+        self.assertEqual(hit['ETag'], miss['ETag'])
+
+    async def test_technology_detail_is_read_with_the_async_orm(self):
+        url = reverse('technology-detail', kwargs={'pk': self.technology.pk})
+
+        response = await self.async_client.get(url, headers={'Authorization': self.authorization})
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.json()['name'], 'Django')
+
+    async def test_errors_fall_back_to_the_sync_view(self):
+        url = reverse('technology-detail', kwargs={'pk': self.technology.pk + 1})
+
+        unauthenticated = await self.async_client.get(url)
+        missing = await self.async_client.get(url, headers={'Authorization': self.authorization})
+
+        self.assertEqual(unauthenticated.status_code, status.HTTP_401_UNAUTHORIZED)
+        self.assertEqual(missing.status_code, status.HTTP_404_NOT_FOUND)
+
+
+processed_values = []
+
+
+@tasks.task
+def record_value(value):
+    processed_values.append(value)
+
+
+@tasks.task
+def always_fails():
+    processed_values.append('attempt')
+    raise RuntimeError('falhou')
+
+
+@override_settings(TASKS_ALWAYS_EAGER=False, TASKS_RETRY_BACKOFF=0, TASKS_MAX_RETRIES=1)
+class TaskQueueTestCase(TestCase):
+
+    def setUp(self) -> None:
+        self.redis = get_redis_connection('default')
+        self.clear_queues()
+        processed_values.clear()
+
+        # Would close the connection holding the test transaction, as the
+        # test client avoids doing for request_finished.
+        patcher = mock.patch('app.tasks.close_old_connections')
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def tearDown(self) -> None:
+        self.clear_queues()
+
+    def clear_queues(self):
+        keys = self.redis.keys('tasks:*')
+        if keys:
+            self.redis.delete(*keys)
+
+    def test_tasks_are_enqueued_only_after_commit(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            record_value.delay(1)
+            self.assertEqual(self.redis.llen(tasks.QUEUE_KEY), 0)
+
+        self.assertEqual(self.redis.llen(tasks.QUEUE_KEY), 1)
+
+        tasks.Worker('test').run(burst=True)
+
+        self.assertEqual(processed_values, [1])
+        self.assertEqual(self.redis.llen(tasks.QUEUE_KEY), 0)
+        self.assertEqual(self.redis.llen('tasks:processing:test'), 0)
+
+    def test_failing_task_is_retried_then_dead_lettered(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            always_fails.delay()
+
+        tasks.Worker('test').run(burst=True)
+
+        self.assertEqual(processed_values, ['attempt', 'attempt'])
+        dead = json.loads(self.redis.lindex(tasks.DEAD_KEY, 0))
+        self.assertEqual(dead['task'], always_fails.name)
+        self.assertEqual(dead['attempts'], 2)
+        self.assertIn('falhou', dead['error'])
+
+        call_command('run_task_worker', requeue_dead=True, stdout=StringIO())
+
+        self.assertEqual(self.redis.llen(tasks.DEAD_KEY), 0)
+        self.assertEqual(json.loads(self.redis.lindex(tasks.QUEUE_KEY, 0))['attempts'], 0)
+
+    def test_messages_left_by_a_crashed_worker_are_requeued(self):
+        message = {'id': 'x', 'task': record_value.name, 'args': [7], 'kwargs': {}, 'attempts': 0}
+        self.redis.lpush('tasks:processing:test', json.dumps(message))
+
+        call_command('run_task_worker', name='test', burst=True, stdout=StringIO())
+
+        self.assertEqual(processed_values, [7])
+
+    def test_write_side_effects_wait_for_the_worker(self):
+        user = User.objects.create_user(username='test1', password='1234', email='test@gmail.com')
+        profile = UserProfile.objects.create(user=user, bio='test', expertise='django')
+
+        with self.captureOnCommitCallbacks(execute=True):
+            Article.objects.create(title='Artigo', content='Conteúdo', author=profile)
+
+        profile.refresh_from_db()
+        self.assertEqual(profile.reputation_score, 0)
+
+        call_command('run_task_worker', name='test', burst=True, stdout=StringIO())
+
+        profile.refresh_from_db()
+        self.assertEqual(profile.reputation_score, 20)
+        self.assertEqual(profile.stats.articles_written, 1)
+
+    def test_redelivered_messages_are_applied_once(self):
+        user = User.objects.create_user(username='test1', password='1234', email='test@gmail.com')
+        profile = UserProfile.objects.create(user=user, bio='test', expertise='django')
+
+        with self.captureOnCommitCallbacks(execute=True):
+            Article.objects.create(title='Artigo', content='Conteúdo', author=profile)
+
+        for payload in self.redis.lrange(tasks.QUEUE_KEY, 0, -1):
+            self.redis.lpush(tasks.QUEUE_KEY, payload)
+
+        call_command('run_task_worker', name='test', burst=True, stdout=StringIO())
+
+        profile.refresh_from_db()
+        self.assertEqual(profile.reputation_score, 20)
+        self.assertEqual(profile.reputation_events.count(), 1)
+        self.assertEqual(profile.stats.articles_written, 1)
+
+    def test_award_retried_after_a_failed_bump_only_bumps_again(self):
+        user = User.objects.create_user(username='test1', password='1234', email='test@gmail.com')
+        profile = UserProfile.objects.create(user=user, bio='test', expertise='django')
+
+        with self.captureOnCommitCallbacks(execute=True):
+            award_reputation.delay(profile.pk, 20, ReputationEvent.Reason.ARTICLE_PUBLISHED)
+
+        with mock.patch('profiles.reputation.bump_namespace', side_effect=[ConnectionError, None]) as bump:
+            tasks.Worker('test').run(burst=True)
+
+        profile.refresh_from_db()
+        self.assertEqual(profile.reputation_score, 20)
+        self.assertEqual(profile.reputation_events.count(), 1)
+        self.assertEqual(bump.call_count, 2)
+        self.assertEqual(self.redis.llen(tasks.DEAD_KEY), 0)
+
+
+class CacheInvalidationTestCase(TestCase):
+
+    def setUp(self) -> None:
+        caches['view_cache'].clear()
+
+    def tearDown(self) -> None:
+        caches['view_cache'].clear()
+
+    def test_bumps_inside_a_transaction_wait_for_the_commit(self):
+        generation = namespace_version('question_1')
+
+        with self.captureOnCommitCallbacks(execute=True):
+            with transaction.atomic():
+                bump_namespace('question_1')
+                bump_namespace('question_1', 'list_all_question_published')
+                self.assertEqual(namespace_version('question_1'), generation)
+
+        self.assertEqual(namespace_version('question_1'), generation + 1)
+
+    def test_rolled_back_bumps_are_not_sent(self):
+        generation = namespace_version('question_1')
+
+        with self.captureOnCommitCallbacks(execute=True) as callbacks:
+            with self.assertRaises(RuntimeError), transaction.atomic():
+                bump_namespace('question_1')
+                raise RuntimeError
+
+        self.assertEqual(callbacks, [])
+        self.assertEqual(namespace_version('question_1'), generation)
+
+    def test_missing_generations_are_seeded_before_the_bump(self):
+        bump_namespace('question_1')
+
+        self.assertGreater(namespace_version('question_1'), time.time() * 1000 - 60_000)
+
+    def test_request_bumps_are_flushed_once_after_the_response(self):
+        generations = [namespace_version('question_1'), namespace_version('profile_1')]
+
+        def get_response(request):
+            bump_namespace('question_1')
+            bump_namespace('question_1', 'profile_1')
+            self.assertEqual(namespace_version('question_1'), generations[0])
+            return HttpResponse()
+
+        middleware = CacheInvalidationMiddleware(get_response)
+        with mock.patch.object(app_cache, 'flush_invalidations', wraps=app_cache.flush_invalidations) as flush:
+            middleware(RequestFactory().post('/'))
+
+        flush.assert_called_once_with({'question_1', 'profile_1'})
+        self.assertEqual([namespace_version('question_1'), namespace_version('profile_1')],
+                         [generation + 1 for generation in generations])
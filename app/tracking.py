@@ -0,0 +1,61 @@
+_MISSING = object()
+
+
+class FieldTrackerMixin:
+    """Remembers the database value of ``tracked_fields`` when an instance is
+    loaded or saved, so signals can detect a state flip without reading the
+    row again.
+
+    Declare it before ``models.Model``::
+
+        class Answer(FieldTrackerMixin, models.Model):
+            tracked_fields = ('is_accepted',)
+    """
+
+    tracked_fields = ()
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._snapshot_tracked_fields()
+        return instance
+
+    def refresh_from_db(self, using=None, fields=None, from_queryset=None):
+        super().refresh_from_db(using=using, fields=fields, from_queryset=from_queryset)
+        self._snapshot_tracked_fields(fields)
+
+    def save(self, *args, **kwargs):
+        super().save(*args, **kwargs)
+        self._snapshot_tracked_fields(kwargs.get('update_fields'))
+
+    def tracked_value(self, field: str, default=None):
+        """Value of ``field`` as last read from or written to the database,
+        or ``default`` when the row does not exist."""
+        if self._state.adding and self.pk is None:
+            return default
+
+        value = getattr(self, '_tracked_values', {}).get(field, _MISSING)
+        if value is _MISSING:
+            # Deferred when loaded, or an instance built by hand with a pk.
+            row = type(self)._base_manager.filter(pk=self.pk).values_list(field).first()
+            value = default if row is None else row[0]
+
+        return value
+
+    def has_changed(self, field: str) -> bool:
+        previous = self.tracked_value(field, default=_MISSING)
+        return previous is not _MISSING and previous != getattr(self, field)
+
+    def _snapshot_tracked_fields(self, fields=None):
+        deferred = self.get_deferred_fields()
+        tracked_values = getattr(self, '_tracked_values', {})
+
+        for field in self.tracked_fields:
+            if fields is not None and field not in fields:
+                continue
+            if field in deferred:
+                tracked_values.pop(field, None)
+            else:
+                tracked_values[field] = getattr(self, field)
+
+        self._tracked_values = tracked_values
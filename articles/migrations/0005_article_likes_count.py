@@ -0,0 +1,32 @@
+# Generated by Django 5.2.7 on 2026-10-18 15:45
+
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce
+
+
+def backfill_likes_count(apps, schema_editor):
+    Article = apps.get_model('articles', 'Article')
+    through = Article.likes.through
+
+    totals = through.objects.filter(
+        article_id=OuterRef('pk')
+    ).values('article_id').annotate(total=Count('pk')).values('total')
+
+    Article.objects.update(likes_count=Coalesce(Subquery(totals, output_field=models.IntegerField()), Value(0)))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('articles', '0004_alter_article_likes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='article',
+            name='likes_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(backfill_likes_count, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,28 @@
+# Generated by Django 5.2.7 on 2026-10-18 16:23
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('articles', '0007_article_created_at_id_idx'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='article',
+            name='article_created_at_id_idx',
+        ),
+        migrations.AddIndex(
+            model_name='article',
+            index=models.Index(condition=models.Q(('is_published', True)), fields=['created_at', 'id'], name='article_published_created_idx'),
+        ),
+        # The technology filter enters through the auto-created M2M table,
+        # which only has single-column indexes.
+        migrations.RunSQL(
+            sql='CREATE INDEX article_technologies_tech_article_idx '
+                'ON articles_article_technologies (technology_id, article_id)',
+            reverse_sql='DROP INDEX IF EXISTS article_technologies_tech_article_idx',
+        ),
+    ]
@@ -1,11 +1,14 @@
 from django.dispatch import receiver
-from django.db.models import F
-from django.core.cache import caches
-from django.db.models.signals import post_save, post_delete
+from django.db.models.signals import post_save, post_delete, m2m_changed
 from articles.models import Article
+from profiles import reputation
+from profiles.models import ReputationEvent
+from profiles.tasks import award_reputation, adjust_stats
+from app.cache import bump_namespace
+from app.counters import M2MCounter
 
 
-cache_view = caches['view_cache']
+likes_counter = M2MCounter(Article.likes, 'likes_count')
 
 
 @receiver(post_save, sender=Article)
@@ -13,24 +16,32 @@ def add_points(sender, instance, created, **kwargs):
     clear_article_cache(instance)
 
     if created:
-        profile = instance.author
-        profile.reputation_score += F('reputation_score') + 20
-        profile.save(update_fields=['reputation_score'])
+        award_reputation.delay(instance.author_id, 20, ReputationEvent.Reason.ARTICLE_PUBLISHED)
+        adjust_stats.delay(instance.author_id, 'articles_written', 1)
 
 
 @receiver(post_delete, sender=Article)
-def decrease_points(sender, instance, **kwargs):
+def decrease_points(sender, instance, origin=None, **kwargs):
     clear_article_cache(instance)
 
-    profile = instance.author
-    new_score = profile.reputation_score - 20
-    profile.reputation_score = max(0, new_score)
-    profile.save(update_fields=['reputation_score'])
+    if not reputation.deleted_with_profile(origin):
+        award_reputation.delay(instance.author_id, -20, ReputationEvent.Reason.ARTICLE_REMOVED)
+        adjust_stats.delay(instance.author_id, 'articles_written', -1)
 
 
-def clear_article_cache(article: Article):
-    key_list = "list_article"
-    cache_view.delete(key_list)
+@receiver(m2m_changed, sender=Article.likes.through)
+def update_likes_count(sender, **kwargs):
+    likes_counter.handle(**kwargs)
+
+
+@receiver(m2m_changed, sender=Article.likes.through)
+def clear_article_cache_on_like(sender, instance, action, reverse, pk_set, **kwargs):
+    if action not in ('post_add', 'post_remove', 'post_clear'):
+        return
 
-    key = f"article_{article.pk}"
-    cache_view.delete(key)
+    article_pks = (pk_set or []) if reverse else [instance.pk]
+    bump_namespace(*[f"article_{pk}" for pk in article_pks])
+
+
+def clear_article_cache(article: Article):
+    bump_namespace(f"article_{article.pk}", "list_article", f"profile_{article.author_id}")
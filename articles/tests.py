@@ -1,8 +1,10 @@
+import json
 from django.urls import reverse
 from django.core.cache import caches
 from django.contrib.auth.models import User, Group
 from rest_framework import status
 from rest_framework.test import APITestCase
+from app.cache import ViewCacheEntry
 from articles.models import Article
 from profiles.models import UserProfile
 from technologies.models import Technology
@@ -68,15 +70,15 @@ class ArticleAPITestCase(APITestCase):
         self.client.logout()
         response = self.client.get(self.url_post, format='json')
 
-        self.assertIn('results', response.data)
-        self.assertEqual(len(response.data['results']), 2)
+        self.assertIn('results', response.json())
+        self.assertEqual(len(response.json()['results']), 2)
         self.assertEqual(response.status_code, status.HTTP_200_OK)
 
     def test_unauthenticated_user_can_see_article_detail(self):
         response = self.client.get(self.url_details)
 
         self.assertEqual(response.status_code, status.HTTP_200_OK)
-        self.assertEqual(response.data['title'], self.article2.title)
+        self.assertEqual(response.json()['title'], self.article2.title)
 
     def test_other_user_cannot_delete_author_article(self):
         self.client.force_authenticate(user=self.profile1.user)
@@ -97,6 +99,7 @@ class ArticleAPITestCase(APITestCase):
     def test_article_created_increased_reputation_to_author(self):
         self.client.force_authenticate(user=self.profile2.user)
 
+        self.profile2.refresh_from_db()
         initial_score = self.profile2.reputation_score
         data = {
             "title": "Como utilizar o Celery no Django",
@@ -165,8 +168,9 @@ class ArticleAPITestCase(APITestCase):
         list_url = reverse('create-article')
 
         self.client.get(list_url, format='json')
-        cached_data_before_post = caches['view_cache'].get("list_article")
-        self.assertIsNotNone(cached_data_before_post)
+        with self.assertNumQueries(0):
+            cached_response = self.client.get(list_url, format='json')
+        self.assertEqual(len(cached_response.json()['results']), 2)
 
         new_article_data = {
             "title": "Artigo Novo Cache",
@@ -175,14 +179,23 @@ class ArticleAPITestCase(APITestCase):
         }
         self.client.post(list_url, new_article_data, format='json')
 
-        cached_data_after_post = caches['view_cache'].get("list_article")
-        self.assertIsNone(cached_data_after_post)
-
         response2 = self.client.get(list_url, format='json')
-        self.assertEqual(len(response2.data['results']), 3)
+        self.assertEqual(len(response2.json()['results']), 3)
+
+        with self.assertNumQueries(0):
+            cached_response_after_reload = self.client.get(list_url, format='json')
+        self.assertEqual(len(cached_response_after_reload.json()['results']), 3)
+
+    def test_article_list_cache_varies_with_query_params(self):
+        list_url = reverse('create-article')
+        self.client.get(list_url, format='json')
+
+        response_search = self.client.get(list_url, {'search': 'React'}, format='json')
+        self.assertEqual(len(response_search.json()['results']), 1)
+        self.assertEqual(response_search.json()['results'][0]['title'], self.article2.title)
 
-        cached_data_after_reload = caches['view_cache'].get("list_article")
-        self.assertIsNotNone(cached_data_after_reload)
+        response_ordering = self.client.get(list_url, {'ordering': 'created_at'}, format='json')
+        self.assertEqual(response_ordering.json()['results'][0]['title'], self.article1.title)
 
     def test_question_detail_is_cached(self):
         self.client.force_authenticate(user=self.profile2.user)
@@ -191,7 +204,30 @@ class ArticleAPITestCase(APITestCase):
         response_ok = self.client.get(article_detail, format='json')
         self.assertEqual(response_ok.status_code, status.HTTP_200_OK)
 
-        question_cached = caches['view_cache'].get(f"article_{self.article1.pk}")
+        question_cached = ViewCacheEntry(f"article_detail_{self.article1.pk}", f"article_{self.article1.pk}").get()
 
         self.assertIsNotNone(question_cached)
-        self.assertEqual(question_cached['title'], self.article1.title)
+        self.assertEqual(json.loads(question_cached)['title'], self.article1.title)
+
+    def test_article_list_runs_constant_number_of_queries(self):
+        for index in range(10):
+            article = Article.objects.create(
+                title=f'Artigo {index}', content='Conteúdo', author=self.profile1
+            )
+            article.technologies.set([self.techonology1, self.techonology3])
+            article.likes.set([self.profile1, self.profile2])
+
+        caches['view_cache'].clear()
+        with self.assertNumQueries(3):
+            response = self.client.get(self.url_post)
+
+        self.assertEqual(len(response.json()['results']), 12)
+        liked_article = next(item for item in response.json()['results'] if item['title'] == 'Artigo 0')
+        self.assertEqual(liked_article['quantity_likes'], 2)
+        self.assertEqual(len(liked_article['technologies']), 2)
+
+    def test_article_list_filters_by_author_name(self):
+        response = self.client.get(self.url_post, {'last_name': 'profile3'})
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual([item['title'] for item in response.json()['results']], [self.article2.title])
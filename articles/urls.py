@@ -3,7 +3,7 @@ from articles.views import ArticleListCreateView, ArticleDetailDeleteView, Artic
 
 
 urlpatterns = [
-    path('articles/', ArticleListCreateView.as_view(), name='create-article'),
-    path('articles/<int:pk>/', ArticleDetailDeleteView.as_view(), name='article-details'),
+    path('articles/', ArticleListCreateView.as_async_view(), name='create-article'),
+    path('articles/<int:pk>/', ArticleDetailDeleteView.as_async_view(), name='article-details'),
     path('articles/<int:pk>/like/', ArticleToggleView.as_view(), name='like-article')
 ]
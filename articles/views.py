@@ -1,30 +1,29 @@
-from django.conf import settings
 from django_filters.rest_framework import DjangoFilterBackend
-from django.core.cache import caches
 from rest_framework import generics, serializers, status
 from rest_framework.permissions import IsAuthenticated, AllowAny
 from rest_framework.response import Response
-from rest_framework.filters import SearchFilter, OrderingFilter
+from rest_framework.filters import OrderingFilter
 from drf_spectacular.utils import extend_schema
 from app.exceptions import ObjectNotFound
+from app.async_views import AsyncReadMixin
+from app.cache import ViewCacheEntry, bump_namespace
+from app.pagination import KeysetPagination
+from app.search import FullTextSearchFilter
 from articles.models import Article
 from articles.serializers import ArticleModelSerializer, ArticleDetailModelSerializer
 from articles.filters import ArticleFilter
+from articles.signals import likes_counter
 from profiles.models import UserProfile
 from profiles.permissions import IsOwner
 
 
-cache_view = caches['view_cache']
-
-
 @extend_schema(
     tags=['Article (Artigo)']
 )
-class ArticleListCreateView(generics.ListCreateAPIView):
-    queryset = Article.objects.filter(is_published=True)
-    filter_backends = (DjangoFilterBackend, SearchFilter, OrderingFilter)
+class ArticleListCreateView(AsyncReadMixin, generics.ListCreateAPIView):
+    filter_backends = (DjangoFilterBackend, OrderingFilter, FullTextSearchFilter)
+    pagination_class = KeysetPagination
     filterset_class = ArticleFilter
-    search_fields = ['title', 'content']
     ordering = ['-created_at']
 
     def get_permissions(self):
@@ -33,6 +32,13 @@ class ArticleListCreateView(generics.ListCreateAPIView):
 
         return [AllowAny()]
 
+    def get_queryset(self):
+        return Article.objects.filter(is_published=True).select_related(
+            'author__user'
+        ).prefetch_related(
+            'technologies'
+        )
+
     def get_object(self):
         obj = super().get_object()
 
@@ -47,15 +53,11 @@ class ArticleListCreateView(generics.ListCreateAPIView):
 
         return ArticleDetailModelSerializer
 
-    def list(self, request, *args, **kwargs):
-        key = "list_article"
-        cached_data = cache_view.get(key)
-        if cached_data:
-            return Response(cached_data, status=status.HTTP_200_OK)
+    def get_cache_entry(self, request, *args, **kwargs):
+        return ViewCacheEntry.for_list(self, request, "list_article")
 
-        response = super().list(request, *args, **kwargs)
-        cache_view.set(key, response.data, timeout=settings.CACHE_TTL)
-        return response
+    def list(self, request, *args, **kwargs):
+        return self.get_cache_entry(request).get_or_build(super().list, request, *args, **kwargs)
 
     def perform_create(self, serializer):
         user = self.request.user
@@ -64,13 +66,11 @@ class ArticleListCreateView(generics.ListCreateAPIView):
         if get_user:
             serializer.save(author=get_user)
 
-        cache_view.delete("list_article")
-
 
 @extend_schema(
     tags=['Article (Artigo)']
 )
-class ArticleDetailDeleteView(generics.RetrieveDestroyAPIView):
+class ArticleDetailDeleteView(AsyncReadMixin, generics.RetrieveDestroyAPIView):
     queryset = Article.objects.all()
     serializer_class = ArticleDetailModelSerializer
 
@@ -88,27 +88,12 @@ class ArticleDetailDeleteView(generics.RetrieveDestroyAPIView):
 
         return obj
 
-    def retrieve(self, request, *args, **kwargs):
-        pk = self.kwargs.get('pk')
-        key = f"article_{pk}"
-        cached_data = cache_view.get(key)
-        if cached_data:
-            return Response(cached_data, status=status.HTTP_200_OK)
-
-        response = super().retrieve(request, *args, **kwargs)
-        cache_view.set(key, response.data, timeout=settings.CACHE_TTL)
-
-        return response
-
-    def destroy(self, request, *args, **kwargs):
+    def get_cache_entry(self, request, *args, **kwargs):
         pk = self.kwargs.get('pk')
-        response = super().destroy(request, *args, **kwargs)
-
-        if response.status_code == status.HTTP_204_NO_CONTENT:
-            cache_view.delete("list_article")
-            cache_view.delete(f"article_{pk}")
+        return ViewCacheEntry(f"article_detail_{pk}", f"article_{pk}", local=True)
 
-        return response
+    def retrieve(self, request, *args, **kwargs):
+        return self.get_cache_entry(request).get_or_build(super().retrieve, request, *args, **kwargs)
 
 
 @extend_schema(
@@ -120,12 +105,15 @@ class ArticleToggleView(generics.GenericAPIView):
     serializer_class = serializers.Serializer
 
     def post(self, request, *args, **kwargs):
-        article = self.get_object()
-        profile = request.user.profile
+        pk = self.kwargs.get('pk')
+        profile_pk = UserProfile.objects.filter(user_id=request.user.id).values_list('pk', flat=True).first()
+        if profile_pk is None:
+            raise ObjectNotFound()
 
-        if profile in article.likes.all():
-            article.likes.remove(profile)
-        else:
-            article.likes.add(profile)
+        toggled = likes_counter.toggle(pk, profile_pk)
+        if toggled is None:
+            raise ObjectNotFound()
 
-        return Response({"likes_count": article.likes.count()}, status=status.HTTP_200_OK)
+        bump_namespace(f"article_{pk}")
+        _, likes_count = toggled
+        return Response({"likes_count": likes_count}, status=status.HTTP_200_OK)
@@ -0,0 +1,23 @@
+from drf_spectacular.contrib.rest_framework_simplejwt import SimpleJWTStatelessUserScheme
+from rest_framework_simplejwt.authentication import JWTStatelessUserAuthentication
+from rest_framework_simplejwt.exceptions import InvalidToken
+from rest_framework_simplejwt.settings import api_settings
+from authentication.revocation import revoked_tokens
+
+
+class RevocableJWTStatelessUserAuthentication(JWTStatelessUserAuthentication):
+    """Stateless JWT authentication that rejects access tokens revoked on
+    logout."""
+
+    def get_validated_token(self, raw_token):
+        validated_token = super().get_validated_token(raw_token)
+
+        jti = validated_token.get(api_settings.JTI_CLAIM)
+        if jti is not None and revoked_tokens.is_revoked(jti):
+            raise InvalidToken('Token revogado')
+
+        return validated_token
+
+
+class RevocableJWTStatelessUserScheme(SimpleJWTStatelessUserScheme):
+    target_class = 'authentication.authentication.RevocableJWTStatelessUserAuthentication'
@@ -0,0 +1,167 @@
+import hashlib
+import logging
+import math
+import threading
+import time
+from django.conf import settings
+from django.core.cache import cache
+from django_redis import get_redis_connection
+
+
+logger = logging.getLogger(__name__)
+
+REVOKED_KEY = 'tokens:revoked'
+REVOKED_CHANNEL = 'tokens:revoked'
+
+
+def blacklist_key(jti: str) -> str:
+    return f"blacklist: {jti}"
+
+
+def redis():
+    return get_redis_connection('default')
+
+
+class BloomFilter:
+    """Set membership with false positives at ``error_rate`` up to
+    ``capacity`` items and no false negatives."""
+
+    def __init__(self, capacity: int, error_rate: float):
+        self.capacity = capacity
+        self.size = max(8, int(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.hashes = max(1, round(self.size / capacity * math.log(2)))
+        self.bits = bytearray((self.size + 7) // 8)
+        self.count = 0
+
+    def add(self, item: str):
+        for position in self._positions(item):
+            self.bits[position >> 3] |= 1 << (position & 7)
+        self.count += 1
+
+    def __contains__(self, item: str) -> bool:
+        return all(self.bits[position >> 3] & (1 << (position & 7)) for position in self._positions(item))
+
+    def _positions(self, item: str):
+        # Double hashing: k positions out of one 128-bit digest.
+        digest = hashlib.blake2b(item.encode(), digest_size=16).digest()
+        first = int.from_bytes(digest[:8], 'little')
+        second = int.from_bytes(digest[8:], 'little') | 1
+        return [(first + i * second) % self.size for i in range(self.hashes)]
+
+
+class RevokedTokens:
+    """Per-worker view of the revoked token ids.
+
+    Revocations are kept in Redis: an exact ``blacklist: <jti>`` key plus a
+    sorted set scored by expiration, announced over pub/sub. Each worker
+    mirrors the unexpired ids in a Bloom filter, so tokens that were never
+    revoked are accepted without a round trip; only probable hits, and
+    every check while the channel is down, go to Redis.
+    """
+
+    def __init__(self):
+        self.filter = self._new_filter()
+        self._listener = None
+        self._lock = threading.Lock()
+
+    def is_revoked(self, jti: str) -> bool:
+        if self.synced() and jti not in self.filter:
+            return False
+
+        return bool(cache.get(blacklist_key(jti)))
+
+    def revoke(self, jti: str, expires_at: int):
+        now = time.time()
+        if expires_at <= now:
+            return
+
+        cache.set(blacklist_key(jti), True, timeout=int(expires_at - now))
+
+        with redis().pipeline(transaction=False) as pipeline:
+            pipeline.zadd(REVOKED_KEY, {jti: expires_at})
+            pipeline.zremrangebyscore(REVOKED_KEY, '-inf', now)
+            pipeline.publish(REVOKED_CHANNEL, jti)
+            pipeline.execute()
+
+        # Our own announcement arrives asynchronously; until then this worker
+        # would keep accepting the token.
+        self.add(jti)
+
+    def add(self, jti: str):
+        # Adds and rebuilds are serialized, so an id added while the filter
+        # is rebuilt lands in the new one instead of the discarded one.
+        with self._lock:
+            self.filter.add(jti)
+            if self.filter.count > self.filter.capacity:
+                # Expired ids only cost false positives; rebuilding drops
+                # them before the error rate climbs.
+                self._reload()
+
+    def reload(self):
+        with self._lock:
+            self._reload()
+
+    def _reload(self):
+        live = [
+            jti.decode() if isinstance(jti, bytes) else jti
+            for jti in redis().zrangebyscore(REVOKED_KEY, time.time(), '+inf')
+        ]
+        # Room for as many new ids as are live, so a large revocation list
+        # does not trigger a rebuild on every add.
+        revoked = self._new_filter(2 * len(live))
+        for jti in live:
+            revoked.add(jti)
+        self.filter = revoked
+
+    def synced(self) -> bool:
+        if self._listener is None:
+            with self._lock:
+                if self._listener is None:
+                    self._listener = RevocationListener(self)
+                    self._listener.start()
+
+        return self._listener.connected.is_set()
+
+    def _new_filter(self, capacity: int = 0) -> BloomFilter:
+        return BloomFilter(
+            max(settings.TOKEN_REVOCATION_FILTER_CAPACITY, capacity),
+            settings.TOKEN_REVOCATION_FILTER_ERROR_RATE
+        )
+
+
+class RevocationListener(threading.Thread):
+
+    def __init__(self, revoked_tokens: RevokedTokens):
+        super().__init__(name='token-revocation', daemon=True)
+        self.revoked_tokens = revoked_tokens
+        self.connected = threading.Event()
+
+    def run(self):
+        while True:
+            try:
+                pubsub = redis().pubsub()
+                pubsub.subscribe(REVOKED_CHANNEL)
+                for message in pubsub.listen():
+                    if message['type'] == 'subscribe':
+                        # Loaded only once subscribed, so no revocation falls
+                        # between the snapshot and the channel.
+                        self.revoked_tokens.reload()
+                        self.connected.set()
+                        continue
+
+                    if message['type'] != 'message':
+                        continue
+
+                    data = message['data']
+                    if isinstance(data, bytes):
+                        data = data.decode()
+                    self.revoked_tokens.add(data)
+
+            except Exception:
+                logger.exception('Lost the token revocation channel, retrying')
+
+            self.connected.clear()
+            time.sleep(1)
+
+
+revoked_tokens = RevokedTokens()
@@ -1,9 +1,15 @@
+import time
+import uuid
+from unittest import mock
 from django.urls import reverse
 from django.contrib.auth.models import User
 from django.core.cache import cache
 from rest_framework import status
+from django.test import SimpleTestCase, override_settings
 from rest_framework.test import APITestCase
-from rest_framework_simplejwt.tokens import RefreshToken
+from rest_framework_simplejwt.tokens import AccessToken, RefreshToken
+from authentication import revocation
+from authentication.revocation import BloomFilter, revoked_tokens
 
 
 class AuthenticationAPITestCase(APITestCase):
@@ -76,3 +82,79 @@ class AuthenticationAPITestCase(APITestCase):
         response = self.client.post(self.url_refresh, {"refresh": refresh_token})
 
         self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_access_token_is_rejected_after_logout(self):
+        login_response = self.client.post(self.url_login, {
+            "username": "test_auth",
+            "password": "strong_password_123"
+        })
+        refresh_token = login_response.data['refresh']
+        access_token = login_response.data['access']
+
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {access_token}')
+        response_ok = self.client.post(self.url_logout, {"refresh": refresh_token})
+        response = self.client.post(self.url_logout, {"refresh": refresh_token})
+
+        self.assertEqual(response_ok.status_code, status.HTTP_204_NO_CONTENT)
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_only_probable_hits_reach_redis(self):
+        self.assertTrue(revoked_tokens.synced() or revoked_tokens._listener.connected.wait(5))
+
+        revoked = AccessToken.for_user(self.user)
+        revoked_tokens.revoke(revoked['jti'], revoked['exp'])
+        self.wait_until(lambda: revoked['jti'] in revoked_tokens.filter)
+
+        with mock.patch.object(revocation, 'cache', wraps=revocation.cache) as cache_mock:
+            self.assertFalse(revoked_tokens.is_revoked(AccessToken.for_user(self.user)['jti']))
+            cache_mock.get.assert_not_called()
+
+            self.assertTrue(revoked_tokens.is_revoked(revoked['jti']))
+            cache_mock.get.assert_called_once()
+
+    def test_revoking_worker_rejects_the_token_before_its_announcement_arrives(self):
+        tokens = revocation.RevokedTokens()
+        # Subscribed, but the announcement of the revocation never arrives.
+        tokens._listener = mock.Mock()
+        tokens._listener.connected.is_set.return_value = True
+
+        token = AccessToken.for_user(self.user)
+        tokens.revoke(token['jti'], token['exp'])
+
+        self.assertIn(token['jti'], tokens.filter)
+        self.assertTrue(tokens.is_revoked(token['jti']))
+
+    @override_settings(TOKEN_REVOCATION_FILTER_CAPACITY=10)
+    def test_rebuilt_filter_grows_with_the_live_revocations(self):
+        tokens = revocation.RevokedTokens()
+        tokens._listener = mock.Mock()
+        tokens._listener.connected.is_set.return_value = True
+        jtis = [uuid.uuid4().hex for _ in range(30)]
+
+        with mock.patch.object(tokens, '_reload', wraps=tokens._reload) as reload:
+            for jti in jtis:
+                tokens.revoke(jti, time.time() + 60)
+
+        self.assertLessEqual(reload.call_count, 2)
+        self.assertGreaterEqual(tokens.filter.capacity, 30)
+        self.assertTrue(all(jti in tokens.filter for jti in jtis))
+
+    def wait_until(self, condition, timeout=5):
+        deadline = time.monotonic() + timeout
+        while not condition():
+            self.assertLess(time.monotonic(), deadline)
+            time.sleep(0.01)
+
+
+class BloomFilterTestCase(SimpleTestCase):
+
+    def test_no_false_negatives_and_bounded_false_positives(self):
+        bloom = BloomFilter(capacity=10_000, error_rate=0.01)
+        members = [uuid.uuid4().hex for _ in range(10_000)]
+        for member in members:
+            bloom.add(member)
+
+        self.assertTrue(all(member in bloom for member in members))
+
+        false_positives = sum(uuid.uuid4().hex in bloom for _ in range(10_000))
+        self.assertLess(false_positives, 200)
@@ -1,6 +1,4 @@
-import time
 import jwt
-from django.core.cache import cache
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework import status
@@ -8,6 +6,7 @@ from rest_framework.permissions import IsAuthenticated
 from rest_framework_simplejwt.tokens import RefreshToken, TokenError
 from rest_framework_simplejwt.views import TokenRefreshView
 from rest_framework_simplejwt.exceptions import InvalidToken
+from authentication.revocation import revoked_tokens
 
 
 class LogoutView(APIView):
@@ -18,15 +17,13 @@ class LogoutView(APIView):
             refresh_token = request.data.get('refresh')
             token = RefreshToken(refresh_token)
 
-            token_jti = token.get('jti')
-            token_expiration = token.get('exp')
+            revoked_tokens.revoke(token.get('jti'), token.get('exp'))
 
-            get_seconds = int(time.time())
-            expires_in = token_expiration - get_seconds
+            # The access token used for the logout stops working as well.
+            if request.auth is not None:
+                revoked_tokens.revoke(request.auth.get('jti'), request.auth.get('exp'))
 
-            if expires_in > 0:
-                cache.set(f"blacklist: {token_jti}", True, timeout=expires_in)
-                return Response({"message": "Logout realizado com sucesso!"}, status=status.HTTP_204_NO_CONTENT)
+            return Response({"message": "Logout realizado com sucesso!"}, status=status.HTTP_204_NO_CONTENT)
 
         except TokenError as e:
             return Response({"erro": f"Token inválido: {str(e)}"}, status=status.HTTP_400_BAD_REQUEST)
@@ -42,7 +39,7 @@ class CustomTokenRefreshView(TokenRefreshView):
             try:
                 token_payload = jwt.decode(refresh_token, options={"verify_signature": False})
                 jti = token_payload.get('jti')
-                if cache.get(f"blacklist: {jti}"):
+                if jti and revoked_tokens.is_revoked(jti):
                     raise InvalidToken("Erro de autenticação")
 
             except jwt.exceptions.DecodeError:
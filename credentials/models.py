@@ -1,8 +1,13 @@
 from django.db import models
+from app.tracking import FieldTrackerMixin
 from profiles.models import UserProfile
 
 
-class Credential(models.Model):
+EXPERIENCE_LEVEL = {'JR': 100, 'PL': 300, 'SR': 500}
+
+
+class Credential(FieldTrackerMixin, models.Model):
+    tracked_fields = ('is_verified',)
 
     class CredentialType(models.TextChoices):
         PROFESSIONAL = 'PRO', 'Profissional'
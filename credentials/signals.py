@@ -1,26 +1,19 @@
 from django.dispatch import receiver
 from django.db.models.signals import post_save, post_delete, pre_save
-from credentials.models import Credential
-from profiles.models import UserProfile
-
-
-EXPERIENCE_LEVEL = {'JR': 100, 'PL': 300, 'SR': 500}
+from credentials.models import Credential, EXPERIENCE_LEVEL
+from credentials.tasks import sync_professional_flag
+from profiles import reputation
+from profiles.models import ReputationEvent, UserProfile
+from profiles.tasks import award_reputation
+from app.cache import bump_namespace
 
 
 @receiver(pre_save, sender=Credential)
 def detect_verification_change(sender, instance, **kwargs):
-    if instance.pk is None:
-        return
+    changed = instance.has_changed('is_verified')
 
-    try:
-        old_instance = Credential.objects.get(pk=instance.pk)
-    except Credential.DoesNotExist:
-        return
-
-    if instance.is_verified and not old_instance.is_verified:
-        instance._verification_changed_to_true = True
-    elif not instance.is_verified and old_instance.is_verified:
-        instance._verification_revoked = True
+    instance._verification_changed_to_true = changed and instance.is_verified
+    instance._verification_revoked = changed and not instance.is_verified
 
 
 @receiver(post_save, sender=Credential)
@@ -28,60 +21,42 @@ def transform_in_professional(sender, instance, created, **kwargs):
     if created:
         return
 
-    was_just_verified = getattr(instance, '_verification_changed_to_true', False)
-    was_just_revoked = getattr(instance, '_verification_revoked', False)
-    profile = instance.profile
-
-    if was_just_verified:
+    if getattr(instance, '_verification_changed_to_true', False):
         add_points(instance)
+        sync_professional_flag.delay(instance.profile_id)
 
-        if instance.experience in EXPERIENCE_LEVEL and not profile.is_professional:
-            UserProfile.objects.filter(pk=profile.pk).update(is_professional=True)
-
-    elif was_just_revoked:
+    elif getattr(instance, '_verification_revoked', False):
         remove_points(instance)
-
-        verifiy_quantity_credential = profile.credential_set.filter(
-            is_verified=True,
-            experience__in=EXPERIENCE_LEVEL.keys()
-        ).exclude(pk=instance.pk).count()
-
-        if verifiy_quantity_credential == 0 and profile.is_professional:
-            UserProfile.objects.filter(pk=profile.pk).update(is_professional=False)
+        sync_professional_flag.delay(instance.profile_id)
 
 
 @receiver(post_delete, sender=Credential)
-def change_reputation_by_credential(sender, instance, **kwargs):
-    profile = instance.profile
-    if instance.is_verified and profile.is_professional:
+def change_reputation_by_credential(sender, instance, origin=None, **kwargs):
+    if reputation.deleted_with_profile(origin):
+        return
+
+    if instance.is_verified and UserProfile.objects.filter(pk=instance.profile_id, is_professional=True).exists():
         remove_points(instance)
+        sync_professional_flag.delay(instance.profile_id)
 
-        count_quantity = profile.credential_set.filter(
-            is_verified=True,
-            experience__in=EXPERIENCE_LEVEL.keys()
-        ).count()
 
-        if count_quantity == 0 and profile.is_professional:
-            UserProfile.objects.filter(pk=profile.pk).update(is_professional=False)
+@receiver(post_save, sender=Credential)
+@receiver(post_delete, sender=Credential)
+def clear_profile_cache(sender, instance, **kwargs):
+    bump_namespace(f"profile_{instance.profile_id}")
 
 
 def add_points(credential: Credential):
-    profile = credential.profile
     points_to_add = EXPERIENCE_LEVEL.get(credential.experience)
     if points_to_add is None:
         return
 
-    profile.reputation_score += points_to_add
-    profile.save(update_fields=['reputation_score'])
+    award_reputation.delay(credential.profile_id, points_to_add, ReputationEvent.Reason.CREDENTIAL_VERIFIED)
 
 
 def remove_points(credential: Credential):
-    profile = credential.profile
     points_to_remove = EXPERIENCE_LEVEL.get(credential.experience)
-
     if points_to_remove is None:
         return
 
-    new_score = profile.reputation_score - points_to_remove
-    profile.reputation_score = max(0, new_score)
-    profile.save(update_fields=['reputation_score'])
+    award_reputation.delay(credential.profile_id, -points_to_remove, ReputationEvent.Reason.CREDENTIAL_REVOKED)
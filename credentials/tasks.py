@@ -0,0 +1,23 @@
+from django.db.models import Exists, OuterRef
+from credentials.models import Credential, EXPERIENCE_LEVEL
+from profiles.models import UserProfile
+from app.cache import bump_namespace
+from app.tasks import task
+
+
+@task
+def sync_professional_flag(profile_id: int):
+    """A profile is professional while it has a verified credential with a
+    known experience level."""
+    verified = Credential.objects.filter(
+        profile=OuterRef('pk'),
+        is_verified=True,
+        experience__in=EXPERIENCE_LEVEL.keys()
+    )
+
+    updated = UserProfile.objects.filter(pk=profile_id).exclude(
+        is_professional=Exists(verified)
+    ).update(is_professional=Exists(verified))
+
+    if updated:
+        bump_namespace(f"profile_{profile_id}")
@@ -4,7 +4,7 @@ from django.core.cache import caches
 from rest_framework import status
 from rest_framework.test import APITestCase
 from credentials.models import Credential
-from profiles.models import UserProfile
+from profiles.models import ReputationEvent, UserProfile
 
 
 class CredentialAPITestCase(APITestCase):
@@ -356,3 +356,51 @@ class CredentialAPITestCase(APITestCase):
 
         expected_score = max(0, score_before_delete - 500)
         self.assertEqual(self.profile.reputation_score, expected_score)
+
+    def test_verification_flip_is_detected_without_reloading_credential(self):
+        credential = Credential.objects.create(
+            profile=self.profile,
+            role="Dev Pleno",
+            type_credential="PRO",
+            experience="PL",
+            institution="Nubank",
+            start_date="2021-01-01",
+            is_verified=False
+        )
+        credential = Credential.objects.get(pk=credential.pk)
+        credential.role = "Dev Pleno II"
+
+        with self.assertNumQueries(1):
+            credential.save(update_fields=['role'])
+
+        credential.is_verified = True
+        credential.save()
+        credential.save()
+
+        self.profile.refresh_from_db()
+        self.assertEqual(self.profile.reputation_score, 300)
+        self.assertTrue(self.profile.is_professional)
+
+    def test_deleting_verified_credential_of_non_professional_profile_keeps_score(self):
+        credential = Credential.objects.create(
+            profile=self.profile,
+            role="Dev Senior",
+            type_credential="PRO",
+            experience="SR",
+            institution="Google",
+            start_date="2020-01-01",
+            is_verified=True
+        )
+        UserProfile.objects.filter(pk=self.profile.pk).update(reputation_score=800, is_professional=False)
+
+        self.client.force_authenticate(user=self.profile.user)
+        response = self.client.delete(reverse('credential-details', kwargs={'pk': credential.pk}))
+        self.assertEqual(response.status_code, status.HTTP_204_NO_CONTENT)
+
+        self.profile.refresh_from_db()
+        self.assertEqual(self.profile.reputation_score, 800)
+        self.assertFalse(
+            ReputationEvent.objects.filter(
+                profile=self.profile, reason=ReputationEvent.Reason.CREDENTIAL_REVOKED
+            ).exists()
+        )
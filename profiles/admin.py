@@ -1,8 +1,20 @@
 from django.contrib import admin
-from profiles.models import UserProfile
+from profiles.models import UserProfile, ReputationEvent, ProfileStats
 
 
 @admin.register(UserProfile)
 class UserProfileAdmin(admin.ModelAdmin):
     list_display = ('user', 'bio', 'avatar', 'expertise',
                     'level', 'reputation_score', 'is_professional')
+
+
+@admin.register(ReputationEvent)
+class ReputationEventAdmin(admin.ModelAdmin):
+    list_display = ('pk', 'profile', 'delta', 'reason', 'created_at')
+    list_filter = ('reason',)
+
+
+@admin.register(ProfileStats)
+class ProfileStatsAdmin(admin.ModelAdmin):
+    list_display = ('profile', 'articles_written', 'answers_accepted')
+    readonly_fields = ('articles_written', 'answers_accepted')
@@ -0,0 +1,10 @@
+from django.core.management.base import BaseCommand
+from profiles.reputation import rebuild_scores
+
+
+class Command(BaseCommand):
+    help = 'Recalcula reputation_score e level de todos os perfis a partir do histórico de reputação'
+
+    def handle(self, *args, **options):
+        updated = rebuild_scores()
+        self.stdout.write(f'{updated} perfil(s) recalculado(s)')
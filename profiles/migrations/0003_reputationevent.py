@@ -0,0 +1,35 @@
+# Generated by Django 5.2.7 on 2026-10-18 15:52
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def seed_opening_balances(apps, schema_editor):
+    UserProfile = apps.get_model('profiles', 'UserProfile')
+    ReputationEvent = apps.get_model('profiles', 'ReputationEvent')
+
+    ReputationEvent.objects.bulk_create(
+        ReputationEvent(profile_id=pk, delta=score, reason='INI')
+        for pk, score in UserProfile.objects.exclude(reputation_score=0).values_list('pk', 'reputation_score')
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('profiles', '0002_alter_userprofile_reputation_score'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ReputationEvent',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('delta', models.IntegerField()),
+                ('reason', models.CharField(choices=[('INI', 'Saldo inicial'), ('ART_PUB', 'Artigo publicado'), ('ART_DEL', 'Artigo removido'), ('ANS_ACC', 'Resposta aceita'), ('ANS_DEL', 'Resposta aceita removida'), ('CRED_VER', 'Credencial verificada'), ('CRED_REV', 'Credencial revogada')], max_length=10)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('profile', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='reputation_events', to='profiles.userprofile')),
+            ],
+        ),
+        migrations.RunPython(seed_opening_balances, migrations.RunPython.noop),
+    ]
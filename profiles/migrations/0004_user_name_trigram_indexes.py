@@ -0,0 +1,28 @@
+from django.contrib.postgres.operations import TrigramExtension
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('auth', '0012_alter_user_first_name_max_length'),
+        ('profiles', '0003_reputationevent'),
+    ]
+
+    # auth_user belongs to django.contrib.auth, so the indexes are created
+    # here. The expressions match what icontains/istartswith compile to.
+    operations = [
+        TrigramExtension(),
+        migrations.RunSQL(
+            sql=[
+                'CREATE INDEX auth_user_first_name_trgm_idx ON auth_user '
+                'USING gin (UPPER(first_name::text) gin_trgm_ops)',
+                'CREATE INDEX auth_user_last_name_trgm_idx ON auth_user '
+                'USING gin (UPPER(last_name::text) gin_trgm_ops)',
+            ],
+            reverse_sql=[
+                'DROP INDEX IF EXISTS auth_user_first_name_trgm_idx',
+                'DROP INDEX IF EXISTS auth_user_last_name_trgm_idx',
+            ],
+        ),
+    ]
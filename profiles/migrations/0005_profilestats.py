@@ -0,0 +1,47 @@
+# Generated by Django 5.2.7 on 2026-10-18 16:35
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models import Count
+
+
+def backfill_stats(apps, schema_editor):
+    UserProfile = apps.get_model('profiles', 'UserProfile')
+    ProfileStats = apps.get_model('profiles', 'ProfileStats')
+    Article = apps.get_model('articles', 'Article')
+    Answer = apps.get_model('answers', 'Answer')
+
+    articles = dict(Article.objects.order_by().values('author').annotate(total=Count('pk')).values_list('author', 'total'))
+    accepted = dict(
+        Answer.objects.filter(is_accepted=True).order_by().values('author')
+        .annotate(total=Count('pk')).values_list('author', 'total')
+    )
+
+    ProfileStats.objects.bulk_create(
+        (
+            ProfileStats(profile_id=pk, articles_written=articles.get(pk, 0), answers_accepted=accepted.get(pk, 0))
+            for pk in UserProfile.objects.values_list('pk', flat=True).iterator()
+        ),
+        batch_size=1000
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('profiles', '0004_user_name_trigram_indexes'),
+        ('articles', '0008_article_list_indexes'),
+        ('answers', '0006_answer_accepted_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ProfileStats',
+            fields=[
+                ('profile', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='stats', serialize=False, to='profiles.userprofile')),
+                ('articles_written', models.PositiveIntegerField(default=0)),
+                ('answers_accepted', models.PositiveIntegerField(default=0)),
+            ],
+        ),
+        migrations.RunPython(backfill_stats, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.7 on 2026-10-18 17:28
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('profiles', '0006_userprofile_avatar_variants'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='reputationevent',
+            name='idempotency_key',
+            field=models.CharField(blank=True, editable=False, max_length=64, null=True, unique=True),
+        ),
+    ]
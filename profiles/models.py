@@ -6,10 +6,43 @@ class UserProfile(models.Model):
     user = models.OneToOneField(User, on_delete=models.CASCADE, related_name='profile')
     bio = models.TextField()
     avatar = models.ImageField(upload_to='profiles/', blank=True, null=True)
+    avatar_variants = models.JSONField(default=dict, blank=True, editable=False)
     expertise = models.TextField()
     level = models.CharField(max_length=40, default='Iniciante', blank=True)
     reputation_score = models.IntegerField(default=0)
     is_professional = models.BooleanField(default=False)
 
+    AVATAR_SIZES = {'small': 40, 'medium': 96, 'large': 256}
+
     def __str__(self) -> str:
         return f'{self.user.first_name} {self.user.last_name}'
+
+
+class ReputationEvent(models.Model):
+
+    class Reason(models.TextChoices):
+        OPENING_BALANCE = 'INI', 'Saldo inicial'
+        ARTICLE_PUBLISHED = 'ART_PUB', 'Artigo publicado'
+        ARTICLE_REMOVED = 'ART_DEL', 'Artigo removido'
+        ANSWER_ACCEPTED = 'ANS_ACC', 'Resposta aceita'
+        ANSWER_REMOVED = 'ANS_DEL', 'Resposta aceita removida'
+        CREDENTIAL_VERIFIED = 'CRED_VER', 'Credencial verificada'
+        CREDENTIAL_REVOKED = 'CRED_REV', 'Credencial revogada'
+
+    profile = models.ForeignKey(UserProfile, on_delete=models.CASCADE, related_name='reputation_events')
+    delta = models.IntegerField()
+    reason = models.CharField(max_length=10, choices=Reason.choices)
+    idempotency_key = models.CharField(max_length=64, unique=True, null=True, blank=True, editable=False)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self) -> str:
+        return f'{self.delta:+d} para {self.profile} ({self.get_reason_display()})'
+
+
+class ProfileStats(models.Model):
+    profile = models.OneToOneField(UserProfile, on_delete=models.CASCADE, primary_key=True, related_name='stats')
+    articles_written = models.PositiveIntegerField(default=0)
+    answers_accepted = models.PositiveIntegerField(default=0)
+
+    def __str__(self) -> str:
+        return f'Estatísticas de {self.profile}'
@@ -0,0 +1,91 @@
+from django.contrib.auth.models import User
+from django.db import transaction
+from django.db.models import Case, F, Value, When
+from django.db.models.functions import Greatest
+from django.db.models.lookups import GreaterThanOrEqual
+from profiles.models import UserProfile, ReputationEvent
+from app.cache import bump_namespace
+
+
+USER_LEVEL = {0: "Iniciante", 500: 'Intermediário', 1000: 'Especialista', 2000: 'Elite'}
+
+
+def get_level_for_score(score):
+    for points, level in sorted(USER_LEVEL.items(), reverse=True):
+        if score >= points:
+            return level
+
+    return USER_LEVEL[0]
+
+
+def level_for(score):
+    """SQL version of get_level_for_score, so level is written by the same
+    UPDATE that changes the score."""
+    return Case(
+        *[
+            When(GreaterThanOrEqual(score, points), then=Value(level))
+            for points, level in sorted(USER_LEVEL.items(), reverse=True)
+        ],
+        default=Value(USER_LEVEL[0])
+    )
+
+
+def award(profile_id: int, delta: int, reason: str, key: str | None = None):
+    """Applies ``delta`` to the score and level with one UPDATE, clamping at
+    zero, and records it in the ledger. An event already recorded under
+    ``key`` is not applied again."""
+    if key is not None and ReputationEvent.objects.filter(idempotency_key=key).exists():
+        # A previous delivery may have failed after the commit but before
+        # the cache was invalidated.
+        bump_namespace(f"profile_{profile_id}")
+        return
+
+    score = Greatest(F('reputation_score') + delta, Value(0))
+
+    with transaction.atomic(savepoint=False):
+        # The UPDATE takes the row lock before the event gets its id, so ids
+        # follow the order the deltas were applied in; rebuild_scores relies
+        # on it.
+        updated = UserProfile.objects.filter(pk=profile_id).update(
+            reputation_score=score,
+            level=level_for(score)
+        )
+        if not updated:
+            return
+
+        # Two deliveries running at once both pass the check above; the
+        # unique key rolls the second one back along with its UPDATE.
+        ReputationEvent.objects.create(profile_id=profile_id, delta=delta, reason=reason, idempotency_key=key)
+
+    bump_namespace(f"profile_{profile_id}")
+
+
+def rebuild_scores() -> int:
+    """Recomputes every score and level by replaying the ledger in order,
+    clamping at zero after each event exactly like award()."""
+    with transaction.atomic():
+        scores = dict.fromkeys(UserProfile.objects.select_for_update().values_list('pk', flat=True), 0)
+
+        events = ReputationEvent.objects.order_by('profile_id', 'pk').values_list('profile_id', 'delta')
+        for profile_id, delta in events.iterator():
+            scores[profile_id] = max(scores[profile_id] + delta, 0)
+
+        UserProfile.objects.bulk_update(
+            [
+                UserProfile(pk=pk, reputation_score=score, level=get_level_for_score(score))
+                for pk, score in scores.items()
+            ],
+            ['reputation_score', 'level'],
+            batch_size=1000
+        )
+
+    bump_namespace(*[f"profile_{pk}" for pk in scores])
+
+    return len(scores)
+
+
+def deleted_with_profile(origin) -> bool:
+    """True when a post_delete comes from the cascade of a profile (or its
+    user) being deleted, in which case there is no score left to change."""
+    model = getattr(origin, 'model', type(origin))
+    return model in (UserProfile, User)
@@ -2,6 +2,7 @@ from rest_framework import serializers
 from django.contrib.auth.models import User, Group
 from profiles.models import UserProfile
 from credentials.serializers import CredentialDetailModelSerializer
+from app.images import ImageVariantsField
 
 
 class UserModelSerializer(serializers.ModelSerializer):
@@ -36,24 +37,37 @@ class UserProfileModelSerializer(serializers.ModelSerializer):
 class UserProfileUpdateModelSerializer(serializers.ModelSerializer):
     first_name = serializers.CharField(source='user.first_name')
     last_name = serializers.CharField(source='user.last_name')
+    avatar_variants = ImageVariantsField('avatar')
 
     class Meta:
         model = UserProfile
-        fields = ['first_name', 'last_name', 'bio', 'avatar', 'expertise']
+        fields = ['first_name', 'last_name', 'bio', 'avatar', 'avatar_variants', 'expertise']
 
 
 class UserProfileDetailModelSerializer(serializers.ModelSerializer):
     first_name = serializers.CharField(source='user.first_name', read_only=True)
     last_name = serializers.CharField(source='user.last_name', read_only=True)
     credentials = CredentialDetailModelSerializer(many=True, read_only=True)
-    articles_written = serializers.IntegerField(read_only=True)
-    answers_accepted = serializers.IntegerField(read_only=True)
+    articles_written = serializers.SerializerMethodField()
+    answers_accepted = serializers.SerializerMethodField()
+    avatar_variants = ImageVariantsField('avatar')
 
     class Meta:
         model = UserProfile
-        fields = ['first_name', 'last_name', 'bio', 'avatar', 'expertise', 'reputation_score',
+        fields = ['first_name', 'last_name', 'bio', 'avatar', 'avatar_variants', 'expertise', 'reputation_score',
                   'articles_written', 'answers_accepted', 'is_professional', 'credentials']
 
+    # A profile without its stats row (until reconcile_counters creates it)
+    # reports zeros instead of leaving the fields out.
+    def get_articles_written(self, profile) -> int:
+        stats = getattr(profile, 'stats', None)
+        return stats.articles_written if stats is not None else 0
+
+    def get_answers_accepted(self, profile) -> int:
+        stats = getattr(profile, 'stats', None)
+        return stats.answers_accepted if stats is not None else 0
+
+
 class UserProfileDeleteModelSerializer(serializers.ModelSerializer):
 
     class Meta:
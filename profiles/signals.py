@@ -1,26 +1,34 @@
 from django.dispatch import receiver
-from django.db.models.signals import post_save
-from profiles.models import UserProfile
+from django.db.models.signals import post_save, post_delete
+from profiles.models import UserProfile, ProfileStats
+from profiles.reputation import get_level_for_score
+from profiles.tasks import recompute_level, build_avatar_variants
+from app import images
+from app.cache import bump_namespace
 
 
-USER_LEVEL = {0: "Iniciante", 500: 'Intermediário', 1000: 'Especialista', 2000: 'Elite'}
+@receiver(post_save, sender=UserProfile)
+def create_profile_stats(sender, instance, created, **kwargs):
+    if created:
+        ProfileStats.objects.create(profile=instance)
 
 
 @receiver(post_save, sender=UserProfile)
 def change_level_user_profile(sender, instance, created, **kwargs):
-
     if created:
         return
 
-    user_profile = instance
-    level_profile = get_level_for_score(user_profile.reputation_score)
-    if level_profile != user_profile.level:
-        UserProfile.objects.filter(pk=user_profile.pk).update(level=level_profile)
+    if instance.level != get_level_for_score(instance.reputation_score):
+        recompute_level.delay(instance.pk)
 
 
-def get_level_for_score(score):
-    for points, level in sorted(USER_LEVEL.items(), reverse=True):
-        if score >= points:
-            return level
+@receiver(post_save, sender=UserProfile)
+def process_avatar(sender, instance, **kwargs):
+    if images.needs_variants(instance.avatar, instance.avatar_variants):
+        build_avatar_variants.delay(instance.pk)
+
 
-    return USER_LEVEL[0]
+@receiver(post_save, sender=UserProfile)
+@receiver(post_delete, sender=UserProfile)
+def clear_profile_cache(sender, instance, **kwargs):
+    bump_namespace(f"profile_{instance.pk}")
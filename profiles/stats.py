@@ -0,0 +1,64 @@
+from django.apps import apps
+from django.db.models import Count, F, IntegerField, OuterRef, Q, Subquery, Value
+from django.db.models.functions import Coalesce
+from profiles.models import UserProfile, ProfileStats
+from app.cache import bump_namespace
+
+
+def adjust(profile_id: int, field: str, delta: int):
+    """Updates one ProfileStats counter after a change moved it by
+    ``delta``. The counter is recounted from its source table with a single
+    UPDATE rather than incremented, so a redelivered task cannot apply the
+    change twice."""
+    if not delta:
+        return
+
+    ProfileStats.objects.filter(profile_id=profile_id).update(**{field: real_counts()[field]})
+    bump_namespace(f"profile_{profile_id}")
+
+
+def count_by_author(queryset):
+    return Coalesce(
+        Subquery(
+            queryset.filter(author=OuterRef('profile_id'))
+            .order_by()
+            .values('author')
+            .annotate(total=Count('pk'))
+            .values('total'),
+            output_field=IntegerField()
+        ),
+        Value(0)
+    )
+
+
+def real_counts() -> dict:
+    # Looked up lazily: articles and answers import profiles.models.
+    Article = apps.get_model('articles', 'Article')
+    Answer = apps.get_model('answers', 'Answer')
+
+    return {
+        'articles_written': count_by_author(Article.objects.all()),
+        'answers_accepted': count_by_author(Answer.objects.filter(is_accepted=True)),
+    }
+
+
+def reconcile() -> int:
+    """Creates missing stats rows and recomputes the ones that drifted from
+    the article and answer tables. Returns how many rows were fixed."""
+    missing = UserProfile.objects.filter(stats__isnull=True).values_list('pk', flat=True)
+    created = ProfileStats.objects.bulk_create(ProfileStats(profile_id=pk) for pk in missing)
+
+    counts = real_counts()
+    drifted = ProfileStats.objects.annotate(
+        **{f'real_{field}': expression for field, expression in counts.items()}
+    ).filter(
+        ~Q(articles_written=F('real_articles_written')) | ~Q(answers_accepted=F('real_answers_accepted'))
+    )
+
+    fixed = set(drifted.values_list('profile_id', flat=True))
+    ProfileStats.objects.filter(profile_id__in=fixed).update(**counts)
+
+    fixed |= {stats.profile_id for stats in created}
+    bump_namespace(*[f"profile_{pk}" for pk in fixed])
+
+    return len(fixed)
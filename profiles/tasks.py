@@ -0,0 +1,42 @@
+from django.db.models import F
+from app import images
+from profiles import reputation, stats
+from profiles.models import UserProfile
+from app.cache import bump_namespace
+from app.tasks import current_task_id, task
+
+
+@task
+def award_reputation(profile_id: int, delta: int, reason: str):
+    reputation.award(profile_id, delta, reason, key=current_task_id())
+
+
+@task
+def adjust_stats(profile_id: int, field: str, delta: int):
+    stats.adjust(profile_id, field, delta)
+
+
+@task
+def recompute_level(profile_id: int):
+    updated = UserProfile.objects.filter(pk=profile_id).exclude(
+        level=reputation.level_for(F('reputation_score'))
+    ).update(level=reputation.level_for(F('reputation_score')))
+
+    if updated:
+        bump_namespace(f"profile_{profile_id}")
+
+
+@task
+def build_avatar_variants(profile_id: int):
+    profile = UserProfile.objects.filter(pk=profile_id).first()
+    if profile is None or not images.needs_variants(profile.avatar, profile.avatar_variants):
+        return
+
+    variants = images.build_variants(profile.avatar, UserProfile.AVATAR_SIZES, crop=True)
+
+    # Skipped if the avatar changed meanwhile; its own task builds those.
+    updated = UserProfile.objects.filter(pk=profile_id, avatar=profile.avatar.name).update(
+        avatar_variants=variants
+    )
+    if updated:
+        bump_namespace(f"profile_{profile_id}")
@@ -1,9 +1,22 @@
+import shutil
+import tempfile
+from io import BytesIO, StringIO
+from PIL import Image
 from django.urls import reverse
+from django.core.management import call_command
 from django.contrib.auth.models import User, Group
 from django.core.cache import caches
+from django.core.files.storage import default_storage
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.db import connection
+from django.test.utils import CaptureQueriesContext, override_settings
 from rest_framework import status
 from rest_framework.test import APITestCase
-from profiles.models import UserProfile
+from profiles import reputation
+from profiles.models import UserProfile, ReputationEvent, ProfileStats
+from articles.models import Article
+from answers.models import Answer
+from questions.models import Question
 
 
 class ProfileAPITestCase(APITestCase):
@@ -83,10 +96,23 @@ class ProfileAPITestCase(APITestCase):
         response = self.client.get(self.url)
 
         self.assertEqual(response.status_code, status.HTTP_200_OK)
-        self.assertEqual(response.data["first_name"], self.user.first_name)
+        self.assertEqual(response.json()["first_name"], self.user.first_name)
 
-        self.assertEqual(response.data["articles_written"], 0)
-        self.assertEqual(response.data["answers_accepted"], 0)
+        self.assertEqual(response.json()["articles_written"], 0)
+        self.assertEqual(response.json()["answers_accepted"], 0)
+
+    def test_get_profile_supports_conditional_get(self):
+        self.client.force_authenticate(user=self.profile.user)
+        response = self.client.get(self.url)
+
+        not_modified = self.client.get(self.url, HTTP_IF_NONE_MATCH=response['ETag'])
+        self.assertEqual(not_modified.status_code, status.HTTP_304_NOT_MODIFIED)
+
+        self.client.patch(self.url, {"bio": "trabalho com dados"}, format='json')
+
+        modified = self.client.get(self.url, HTTP_IF_NONE_MATCH=response['ETag'])
+        self.assertEqual(modified.status_code, status.HTTP_200_OK)
+        self.assertEqual(modified.json()["bio"], "trabalho com dados")
 
     def test_only_owner_can_update(self):
         self.client.force_authenticate(user=self.profile.user)
@@ -146,3 +172,156 @@ class ProfileAPITestCase(APITestCase):
 
         self.profile.refresh_from_db()
         self.assertEqual(self.profile.level, 'Elite')
+
+    def test_award_updates_score_and_level_in_one_statement(self):
+        with self.assertNumQueries(2):
+            reputation.award(self.profile.pk, 520, ReputationEvent.Reason.CREDENTIAL_VERIFIED)
+
+        self.profile.refresh_from_db()
+        self.assertEqual(self.profile.reputation_score, 520)
+        self.assertEqual(self.profile.level, 'Intermediário')
+        self.assertEqual(self.profile.reputation_events.get().delta, 520)
+
+    def test_score_never_goes_below_zero(self):
+        reputation.award(self.profile.pk, -20, ReputationEvent.Reason.ARTICLE_REMOVED)
+
+        self.profile.refresh_from_db()
+        self.assertEqual(self.profile.reputation_score, 0)
+
+    def test_rebuild_reputation_replays_the_ledger(self):
+        reputation.award(self.profile.pk, 1000, ReputationEvent.Reason.CREDENTIAL_VERIFIED)
+        reputation.award(self.profile.pk, 20, ReputationEvent.Reason.ANSWER_ACCEPTED)
+        UserProfile.objects.filter(pk__in=[self.profile.pk, self.profile2.pk]).update(
+            reputation_score=7, level='Elite'
+        )
+
+        call_command('rebuild_reputation', stdout=StringIO())
+
+        self.profile.refresh_from_db()
+        self.profile2.refresh_from_db()
+        self.assertEqual(self.profile.reputation_score, 1020)
+        self.assertEqual(self.profile.level, 'Especialista')
+        self.assertEqual(self.profile2.reputation_score, 0)
+        self.assertEqual(self.profile2.level, 'Iniciante')
+
+    def test_rebuild_reputation_clamps_at_zero_after_every_event(self):
+        reputation.award(self.profile.pk, -20, ReputationEvent.Reason.ARTICLE_REMOVED)
+        reputation.award(self.profile.pk, 20, ReputationEvent.Reason.ARTICLE_PUBLISHED)
+        self.profile.refresh_from_db()
+        live_score = self.profile.reputation_score
+
+        call_command('rebuild_reputation', stdout=StringIO())
+
+        self.profile.refresh_from_db()
+        self.assertEqual(live_score, 20)
+        self.assertEqual(self.profile.reputation_score, live_score)
+
+    def test_profile_stats_follow_articles_and_accepted_answers(self):
+        self.client.force_authenticate(user=self.profile.user)
+        article = Article.objects.create(title='Artigo', content='Conteúdo', author=self.profile)
+        question = Question.objects.create(title='Pergunta', content='Conteúdo', profile=self.profile2)
+        answer = Answer.objects.create(content='Resposta', question=question, author=self.profile)
+
+        answer.is_accepted = True
+        answer.save()
+
+        response = self.client.get(self.url)
+        self.assertEqual(response.json()["articles_written"], 1)
+        self.assertEqual(response.json()["answers_accepted"], 1)
+
+        # Deletes run in a transaction; the cache is invalidated on commit.
+        with self.captureOnCommitCallbacks(execute=True):
+            article.delete()
+            question.delete()
+
+        response = self.client.get(self.url)
+        self.assertEqual(response.json()["articles_written"], 0)
+        self.assertEqual(response.json()["answers_accepted"], 0)
+
+    def test_profile_detail_reads_stats_without_joining_articles_and_answers(self):
+        self.client.force_authenticate(user=self.profile.user)
+
+        with CaptureQueriesContext(connection) as queries:
+            self.client.get(self.url)
+
+        profile_query = next(query['sql'] for query in queries if 'profiles_profilestats' in query['sql'])
+        self.assertNotIn('articles_article', profile_query)
+        self.assertNotIn('answers_answer', profile_query)
+
+    def test_profile_without_stats_row_reports_zero(self):
+        self.client.force_authenticate(user=self.profile.user)
+        ProfileStats.objects.filter(profile=self.profile).delete()
+
+        response = self.client.get(self.url)
+
+        self.assertEqual(response.json()["articles_written"], 0)
+        self.assertEqual(response.json()["answers_accepted"], 0)
+
+    def test_reconcile_counters_rebuilds_profile_stats(self):
+        Article.objects.create(title='Artigo', content='Conteúdo', author=self.profile)
+        ProfileStats.objects.filter(profile=self.profile).update(articles_written=9)
+        ProfileStats.objects.filter(profile=self.profile2).delete()
+
+        call_command('reconcile_counters', stdout=StringIO())
+
+        self.assertEqual(ProfileStats.objects.get(profile=self.profile).articles_written, 1)
+        self.assertEqual(ProfileStats.objects.get(profile=self.profile2).articles_written, 0)
+
+
+class AvatarVariantsTestCase(APITestCase):
+
+    def setUp(self):
+        caches['view_cache'].clear()
+
+        media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media_root)
+        settings_override = override_settings(MEDIA_ROOT=media_root)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+
+        self.user = User.objects.create_user(username='avatar', password='1234', email='avatar@gmail.com')
+        self.profile = UserProfile.objects.create(user=self.user, bio='test', expertise='django')
+        self.url = reverse('details-profile', kwargs={'pk': self.profile.pk})
+        self.client.force_authenticate(user=self.user)
+
+    def tearDown(self) -> None:
+        caches['view_cache'].clear()
+
+    def upload(self, color, size=(600, 400)):
+        buffer = BytesIO()
+        Image.new('RGB', size, color).save(buffer, 'PNG')
+        return SimpleUploadedFile('avatar.png', buffer.getvalue(), content_type='image/png')
+
+    def test_uploaded_avatar_gets_square_webp_variants(self):
+        self.profile.avatar = self.upload('red')
+        self.profile.save()
+
+        variants = self.client.get(self.url).json()['avatar_variants']
+
+        self.assertEqual(set(variants), {'small', 'medium', 'large'})
+        self.profile.refresh_from_db()
+        for name, side in UserProfile.AVATAR_SIZES.items():
+            path = self.profile.avatar_variants[name]
+            self.assertTrue(variants[name].endswith(path))
+            with default_storage.open(path) as file, Image.open(file) as image:
+                self.assertEqual((image.format, image.size), ('WEBP', (side, side)))
+
+    def test_variants_are_named_by_content_and_follow_the_current_avatar(self):
+        self.profile.avatar = self.upload('red')
+        self.profile.save()
+        self.profile.refresh_from_db()
+        first = self.profile.avatar_variants
+
+        self.profile.avatar = self.upload('red')
+        self.profile.save()
+        self.profile.refresh_from_db()
+        self.assertNotEqual(self.profile.avatar_variants['source'], first['source'])
+        self.assertEqual(self.profile.avatar_variants['small'], first['small'])
+
+        self.profile.avatar = self.upload('blue')
+        self.profile.save()
+        self.profile.refresh_from_db()
+        self.assertNotEqual(self.profile.avatar_variants['small'], first['small'])
+
+        UserProfile.objects.filter(pk=self.profile.pk).update(avatar_variants=first)
+        self.assertIsNone(self.client.get(self.url).json()['avatar_variants'])
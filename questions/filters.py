@@ -1,18 +1,13 @@
 import django_filters
+from app.filters import TrigramNameFilter
 from questions.models import Question
 
 
 class QuestionFilter(django_filters.FilterSet):
     created_at = django_filters.NumberFilter(field_name='created_at', lookup_expr='year')
 
-    first_name = django_filters.CharFilter(
-        field_name='author__user__first_name',
-        lookup_expr='icontains'
-    )
-    last_name = django_filters.CharFilter(
-        field_name='author__user__last_name',
-        lookup_expr='icontains'
-    )
+    first_name = TrigramNameFilter(field_name='profile__user__first_name')
+    last_name = TrigramNameFilter(field_name='profile__user__last_name')
 
     is_solutioned = django_filters.BooleanFilter(field_name='is_solutioned')
 
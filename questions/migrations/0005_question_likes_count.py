@@ -0,0 +1,32 @@
+# Generated by Django 5.2.7 on 2026-10-18 15:45
+
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce
+
+
+def backfill_likes_count(apps, schema_editor):
+    Question = apps.get_model('questions', 'Question')
+    through = Question.likes.through
+
+    totals = through.objects.filter(
+        question_id=OuterRef('pk')
+    ).values('question_id').annotate(total=Count('pk')).values('total')
+
+    Question.objects.update(likes_count=Coalesce(Subquery(totals, output_field=models.IntegerField()), Value(0)))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('questions', '0004_alter_question_likes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='question',
+            name='likes_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(backfill_likes_count, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,32 @@
+# Generated by Django 5.2.7 on 2026-10-18 16:23
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('questions', '0007_question_created_at_id_idx'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='question',
+            name='question_created_at_id_idx',
+        ),
+        migrations.AddIndex(
+            model_name='question',
+            index=models.Index(condition=models.Q(('is_published', True)), fields=['created_at', 'id'], name='question_published_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='question',
+            index=models.Index(condition=models.Q(('is_published', True), ('is_solutioned', False)), fields=['created_at', 'id'], name='question_unsolved_created_idx'),
+        ),
+        # The technology filter enters through the auto-created M2M table,
+        # which only has single-column indexes.
+        migrations.RunSQL(
+            sql='CREATE INDEX question_technologies_tech_question_idx '
+                'ON questions_question_technologies (technology_id, question_id)',
+            reverse_sql='DROP INDEX IF EXISTS question_technologies_tech_question_idx',
+        ),
+    ]
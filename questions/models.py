@@ -1,4 +1,6 @@
+from django.contrib.postgres.indexes import GinIndex
 from django.db import models
+from app.search import search_vector_field
 from profiles.models import UserProfile
 from technologies.models import Technology
 
@@ -12,6 +14,23 @@ class Question(models.Model):
     profile = models.ForeignKey(UserProfile, on_delete=models.CASCADE, related_name='author')
     technologies = models.ManyToManyField(Technology, related_name='question_tags')
     likes = models.ManyToManyField(UserProfile, related_name='question_likes')
+    likes_count = models.PositiveIntegerField(default=0, editable=False)
+    search_vector = search_vector_field()
+
+    class Meta:
+        indexes = [
+            GinIndex(fields=['search_vector'], name='question_search_vector_idx'),
+            models.Index(
+                fields=['created_at', 'id'],
+                name='question_published_created_idx',
+                condition=models.Q(is_published=True)
+            ),
+            models.Index(
+                fields=['created_at', 'id'],
+                name='question_unsolved_created_idx',
+                condition=models.Q(is_published=True, is_solutioned=False)
+            ),
+        ]
 
     def __str__(self) -> str:
         return self.title
@@ -1,5 +1,4 @@
 from rest_framework import serializers
-from drf_spectacular.utils import extend_schema_field
 from questions.models import Question
 from technologies.models import Technology
 from technologies.serializers import TechnologyDetailSerializer
@@ -19,7 +18,7 @@ class QuestionModelSerializer(serializers.ModelSerializer):
 
 class QuestionListModelSerializer(serializers.ModelSerializer):
     technologies = TechnologyDetailSerializer(many=True, read_only=True)
-    quantity_likes = serializers.SerializerMethodField()
+    quantity_likes = serializers.IntegerField(source='likes_count', read_only=True)
     profile_name1 = serializers.CharField(source='profile.user.first_name')
     profile_name2 = serializers.CharField(source='profile.user.last_name')
 
@@ -28,15 +27,11 @@ class QuestionListModelSerializer(serializers.ModelSerializer):
         fields = ['pk', 'title', 'content', 'is_solutioned', 'created_at',
                   'technologies', 'profile_name1', 'profile_name2', 'quantity_likes']
 
-    @extend_schema_field(serializers.IntegerField())
-    def get_quantity_likes(self, obj):
-        return obj.likes.count()
-
 
 class QuestionDetailModelSerializer(serializers.ModelSerializer):
     technologies = TechnologyDetailSerializer(many=True, read_only=True)
     answers = AnswerDetailModelSerializer(many=True, read_only=True)
-    quantity_likes = serializers.SerializerMethodField()
+    quantity_likes = serializers.IntegerField(source='likes_count', read_only=True)
     profile_name1 = serializers.CharField(source='profile.user.first_name')
     profile_name2 = serializers.CharField(source='profile.user.last_name')
 
@@ -45,10 +40,6 @@ class QuestionDetailModelSerializer(serializers.ModelSerializer):
         fields = ['title', 'content', 'is_solutioned', 'created_at', 'answers',
                   'technologies', 'profile_name1', 'profile_name2', 'quantity_likes']
 
-    @extend_schema_field(serializers.IntegerField())
-    def get_quantity_likes(self, obj):
-        return obj.likes.count()
-
 
 class QuestionDeleteModelSerializer(serializers.ModelSerializer):
 
@@ -0,0 +1,28 @@
+from django.dispatch import receiver
+from django.db.models.signals import post_save, post_delete, m2m_changed
+from questions.models import Question
+from app.cache import bump_namespace
+from app.counters import M2MCounter
+
+
+likes_counter = M2MCounter(Question.likes, 'likes_count')
+
+
+@receiver(post_save, sender=Question)
+@receiver(post_delete, sender=Question)
+def clear_question_cache(sender, instance, **kwargs):
+    bump_namespace(f"question_{instance.pk}", "list_all_question_published")
+
+
+@receiver(m2m_changed, sender=Question.likes.through)
+def update_likes_count(sender, **kwargs):
+    likes_counter.handle(**kwargs)
+
+
+@receiver(m2m_changed, sender=Question.likes.through)
+def clear_question_cache_on_like(sender, instance, action, reverse, pk_set, **kwargs):
+    if action not in ('post_add', 'post_remove', 'post_clear'):
+        return
+
+    question_pks = (pk_set or []) if reverse else [instance.pk]
+    bump_namespace(*[f"question_{pk}" for pk in question_pks])
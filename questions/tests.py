@@ -1,8 +1,15 @@
+import json
+from io import StringIO
 from django.urls import reverse
+from django.core.management import call_command
+from django.db import connection
 from django.core.cache import caches
+from django.test import override_settings
 from django.contrib.auth.models import User, Group
 from rest_framework import status
 from rest_framework.test import APITestCase
+from app.cache import ViewCacheEntry, build_cache_key
+from questions.filters import QuestionFilter
 from questions.models import Question
 from answers.models import Answer
 from profiles.models import UserProfile
@@ -132,7 +139,7 @@ class QuestionAPITestCase(APITestCase):
         response = self.client.get(self.url_create_list_question)
 
         self.assertEqual(response.status_code, status.HTTP_200_OK)
-        self.assertEqual(len(response.data['results']), 2)
+        self.assertEqual(len(response.json()['results']), 2)
 
     def test_anyone_can_see_question_details(self):
         response = self.client.get(self.url_detail_question)
@@ -218,8 +225,9 @@ class QuestionAPITestCase(APITestCase):
         list_question_url = reverse('create-question')
 
         self.client.get(list_question_url, format='json')
-        cached_data_before_post = caches['view_cache'].get("list_all_question_published")
-        self.assertIsNotNone(cached_data_before_post)
+        with self.assertNumQueries(0):
+            cached_response = self.client.get(list_question_url, format='json')
+        self.assertEqual(len(cached_response.json()['results']), 2)
 
         new_question_data = {
             "title": "Pergunta Novo Cache",
@@ -228,14 +236,27 @@ class QuestionAPITestCase(APITestCase):
         }
         self.client.post(list_question_url, new_question_data, format='json')
 
-        cached_data_after_post = caches['view_cache'].get("list_all_question_published")
-        self.assertIsNone(cached_data_after_post)
-
         response2 = self.client.get(list_question_url, format='json')
-        self.assertEqual(len(response2.data['results']), 3)
+        self.assertEqual(len(response2.json()['results']), 3)
+
+        with self.assertNumQueries(0):
+            cached_response_after_reload = self.client.get(list_question_url, format='json')
+        self.assertEqual(len(cached_response_after_reload.json()['results']), 3)
+
+    def test_question_list_cache_varies_with_query_params(self):
+        self.client.get(self.url_create_list_question, format='json')
 
-        cached_data_after_reload = caches['view_cache'].get("list_all_question_published")
-        self.assertIsNotNone(cached_data_after_reload)
+        response_search = self.client.get(self.url_create_list_question, {'search': 'Rust'}, format='json')
+        self.assertEqual(len(response_search.json()['results']), 1)
+        self.assertEqual(response_search.json()['results'][0]['title'], self.question2.title)
+
+        response_filter = self.client.get(self.url_create_list_question, {'technologies': 'Python'}, format='json')
+        self.assertEqual(len(response_filter.json()['results']), 1)
+        self.assertEqual(response_filter.json()['results'][0]['title'], self.question1.title)
+
+        with self.assertNumQueries(0):
+            response_unknown_param = self.client.get(self.url_create_list_question, {'utm_source': 'x'}, format='json')
+        self.assertEqual(len(response_unknown_param.json()['results']), 2)
 
     def test_question_detail_is_cached(self):
         self.client.force_authenticate(user=self.profile1.user)
@@ -244,7 +265,295 @@ class QuestionAPITestCase(APITestCase):
         response_ok = self.client.get(question_detail, format='json')
         self.assertEqual(response_ok.status_code, status.HTTP_200_OK)
 
-        question_cached = caches['view_cache'].get(f"question_detail_{self.question1.pk}")
+        cache_entry = ViewCacheEntry(f"question_detail_{self.question1.pk}", f"question_{self.question1.pk}")
+        question_cached = cache_entry.get()
 
         self.assertIsNotNone(question_cached)
-        self.assertEqual(question_cached['title'], self.question1.title)
+        self.assertEqual(json.loads(question_cached)['title'], self.question1.title)
+
+    def test_question_detail_cache_is_invalidated_when_question_changes(self):
+        self.client.get(self.url_detail_question)
+        key = build_cache_key(f"question_detail_{self.question1.pk}", f"question_{self.question1.pk}")
+        self.assertIsNotNone(ViewCacheEntry(f"question_detail_{self.question1.pk}", f"question_{self.question1.pk}").get())
+
+        self.question1.title = 'Autenticação JWT no django'
+        self.question1.save()
+
+        new_key = build_cache_key(f"question_detail_{self.question1.pk}", f"question_{self.question1.pk}")
+        self.assertNotEqual(key, new_key)
+
+        response = self.client.get(self.url_detail_question)
+        self.assertEqual(response.json()['title'], 'Autenticação JWT no django')
+
+    def test_question_detail_supports_conditional_get(self):
+        response = self.client.get(self.url_detail_question)
+        etag = response['ETag']
+        self.assertTrue(response.has_header('Last-Modified'))
+
+        with self.assertNumQueries(0):
+            not_modified = self.client.get(self.url_detail_question, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(not_modified.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(not_modified.content, b'')
+        self.assertEqual(not_modified['ETag'], etag)
+
+        not_modified_since = self.client.get(
+            self.url_detail_question, HTTP_IF_MODIFIED_SINCE=response['Last-Modified']
+        )
+        self.assertEqual(not_modified_since.status_code, status.HTTP_304_NOT_MODIFIED)
+
+        self.question1.title = 'Autenticação por sessão no django'
+        self.question1.save()
+
+        modified = self.client.get(self.url_detail_question, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(modified.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(modified['ETag'], etag)
+
+    def test_question_list_runs_constant_number_of_queries(self):
+        for index in range(10):
+            question = Question.objects.create(
+                title=f'Pergunta {index}', content='Conteúdo', profile=self.profile3
+            )
+            question.technologies.set([self.techonology1, self.techonology3])
+            question.likes.set([self.profile1, self.profile2])
+
+        caches['view_cache'].clear()
+        with self.assertNumQueries(3):
+            response = self.client.get(self.url_create_list_question)
+
+        self.assertEqual(len(response.json()['results']), 12)
+        liked_question = next(item for item in response.json()['results'] if item['title'] == 'Pergunta 0')
+        self.assertEqual(liked_question['quantity_likes'], 2)
+        self.assertEqual(len(liked_question['technologies']), 2)
+
+    def test_question_detail_runs_constant_number_of_queries(self):
+        for index in range(20):
+            answer = Answer.objects.create(
+                content=f'Resposta {index}', author=self.profile3, question=self.question1
+            )
+            answer.upvotes.set([self.profile1, self.profile2])
+        self.question1.likes.set([self.profile2, self.profile3])
+
+        caches['view_cache'].clear()
+        with self.assertNumQueries(3):
+            response = self.client.get(self.url_detail_question)
+
+        data = response.json()
+        self.assertEqual(len(data['answers']), 21)
+        self.assertEqual(data['quantity_likes'], 2)
+        self.assertEqual(data['answers'][0]['quantity_upvotes'], 0)
+        self.assertEqual(data['answers'][1]['quantity_upvotes'], 2)
+        self.assertEqual(data['answers'][1]['profile_name1'], self.user3.first_name)
+
+    def test_likes_count_follows_likes_changes(self):
+        self.question1.likes.add(self.profile1, self.profile2)
+        self.question1.likes.add(self.profile2)
+        self.question1.refresh_from_db()
+        self.assertEqual(self.question1.likes_count, 2)
+
+        self.question1.likes.remove(self.profile2, self.profile3)
+        self.question1.refresh_from_db()
+        self.assertEqual(self.question1.likes_count, 1)
+
+        self.profile3.question_likes.add(self.question1)
+        self.question1.refresh_from_db()
+        self.assertEqual(self.question1.likes_count, 2)
+
+        self.profile3.question_likes.clear()
+        self.question1.refresh_from_db()
+        self.assertEqual(self.question1.likes_count, 1)
+
+        self.question1.likes.clear()
+        self.question1.refresh_from_db()
+        self.assertEqual(self.question1.likes_count, 0)
+
+    def test_reconcile_counters_repairs_drift(self):
+        self.question1.likes.add(self.profile1, self.profile2)
+        Question.objects.filter(pk=self.question1.pk).update(likes_count=10)
+
+        call_command('reconcile_counters', stdout=StringIO())
+
+        self.question1.refresh_from_db()
+        self.assertEqual(self.question1.likes_count, 2)
+
+    def test_question_list_can_be_ordered_by_likes(self):
+        question = Question.objects.create(title='Mais curtida', content='Conteúdo', profile=self.profile3)
+        question.likes.add(self.profile1, self.profile2)
+
+        response = self.client.get(self.url_create_list_question, {'ordering': '-likes_count'})
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.json()['results'][0]['title'], 'Mais curtida')
+        self.assertEqual(response.json()['results'][0]['quantity_likes'], 2)
+
+    def test_like_toggle_runs_constant_number_of_queries(self):
+        self.question1.likes.add(self.profile1, self.profile3)
+        self.client.force_authenticate(user=self.profile2.user)
+
+        with self.assertNumQueries(2):
+            response = self.client.post(self.url_like_question)
+        self.assertEqual(response.data['likes_count'], 3)
+
+        with self.assertNumQueries(2):
+            response = self.client.post(self.url_like_question)
+        self.assertEqual(response.data['likes_count'], 2)
+        self.assertFalse(self.question1.likes.filter(pk=self.profile2.pk).exists())
+
+    def test_like_toggle_invalidates_question_detail(self):
+        self.client.get(self.url_detail_question)
+        self.client.force_authenticate(user=self.profile2.user)
+        self.client.post(self.url_like_question)
+
+        response = self.client.get(self.url_detail_question)
+
+        self.assertEqual(response.json()['quantity_likes'], 1)
+
+    def test_like_toggle_on_missing_question_returns_not_found(self):
+        self.client.force_authenticate(user=self.profile2.user)
+
+        response = self.client.post(reverse('like-question', kwargs={"pk": 999999}))
+
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_search_matches_portuguese_word_variants(self):
+        response = self.client.get(self.url_create_list_question, {'search': 'autenticar'})
+
+        self.assertEqual([item['title'] for item in response.json()['results']], [self.question1.title])
+
+    def test_search_ranks_title_matches_first(self):
+        Question.objects.create(
+            title='Dúvida sobre ownership',
+            content='No Rust, o ownership impede que eu use a lista depois do move',
+            profile=self.profile3
+        )
+        question = Question.objects.create(
+            title='Ownership em Rust',
+            content='Como funciona?',
+            profile=self.profile3
+        )
+
+        response = self.client.get(self.url_create_list_question, {'search': 'rust ownership'})
+
+        titles = [item['title'] for item in response.json()['results']]
+        self.assertEqual(titles[0], question.title)
+        self.assertEqual(len(titles), 2)
+
+        ordered = self.client.get(self.url_create_list_question, {'search': 'rust ownership', 'ordering': 'created_at'})
+        self.assertEqual(ordered.json()['results'][0]['title'], 'Dúvida sobre ownership')
+
+    def test_question_list_filters_by_author_name(self):
+        response = self.client.get(self.url_create_list_question, {'last_name': 'PROFILE3'})
+        self.assertEqual([item['title'] for item in response.json()['results']], [self.question2.title])
+
+        response = self.client.get(self.url_create_list_question, {'first_name': 'te'})
+        self.assertEqual(len(response.json()['results']), 2)
+
+    def test_short_author_name_terms_match_the_start_of_the_name(self):
+        response = self.client.get(self.url_create_list_question, {'last_name': 'ro'})
+        self.assertEqual(response.json()['results'], [])
+
+        response = self.client.get(self.url_create_list_question, {'last_name': 'pr'})
+        self.assertEqual(len(response.json()['results']), 2)
+
+        response = self.client.get(self.url_create_list_question, {'last_name': 'ofile3'})
+        self.assertEqual([item['title'] for item in response.json()['results']], [self.question2.title])
+
+    def test_author_name_filter_is_served_by_trigram_index(self):
+        queryset = QuestionFilter({'first_name': 'test3'}, queryset=Question.objects.all()).qs
+
+        # The tables are tiny, so keep the planner off plain scans.
+        with connection.cursor() as cursor:
+            cursor.execute('SET LOCAL enable_seqscan = off')
+            cursor.execute('SET LOCAL enable_indexscan = off')
+
+        self.assertIn('auth_user_first_name_trgm_idx', queryset.explain())
+
+    def test_keyset_pagination_walks_every_question_once(self):
+        Question.objects.bulk_create(
+            Question(title=f'Pergunta {index}', content='Conteúdo', profile=self.profile3)
+            for index in range(110)
+        )
+        # Same timestamp for a block of rows, so pk has to break the ties.
+        Question.objects.filter(title__startswith='Pergunta 1').update(created_at=self.question1.created_at)
+        expected = list(Question.objects.order_by('-created_at', '-pk').values_list('pk', flat=True))
+
+        seen = []
+        url = f'{self.url_create_list_question}?cursor='
+        while url:
+            caches['view_cache'].clear()
+            with self.assertNumQueries(2):
+                response = self.client.get(url)
+
+            self.assertNotIn('count', response.json())
+            seen.extend(item['pk'] for item in response.json()['results'])
+            url = response.json()['next']
+
+        self.assertEqual(seen, expected)
+
+    def test_keyset_previous_link_returns_the_previous_page(self):
+        Question.objects.bulk_create(
+            Question(title=f'Pergunta {index}', content='Conteúdo', profile=self.profile3)
+            for index in range(60)
+        )
+
+        first_page = self.client.get(self.url_create_list_question, {'cursor': ''}).json()
+        self.assertIsNone(first_page['previous'])
+
+        second_page = self.client.get(first_page['next']).json()
+        self.assertEqual(len(second_page['results']), 12)
+        self.assertIsNone(second_page['next'])
+
+        previous_page = self.client.get(second_page['previous']).json()
+        self.assertEqual(previous_page['results'], first_page['results'])
+
+    def test_page_number_and_keyset_first_pages_are_cached_apart(self):
+        page_number = self.client.get(self.url_create_list_question).json()
+        keyset = self.client.get(self.url_create_list_question, {'cursor': ''}).json()
+
+        self.assertIn('count', page_number)
+        self.assertNotIn('count', keyset)
+        self.assertEqual(keyset['results'], page_number['results'])
+
+    def test_invalid_cursor_returns_not_found(self):
+        response = self.client.get(self.url_create_list_question, {'cursor': 'nao-e-um-cursor'})
+
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    @override_settings(PAGINATION_EXACT_COUNT_THRESHOLD=5)
+    def test_unfiltered_list_count_is_cached_above_threshold(self):
+        Question.objects.bulk_create(
+            Question(title=f'Pergunta {index}', content='Conteúdo', profile=self.profile3)
+            for index in range(10)
+        )
+        total = Question.objects.filter(is_published=True).count()
+
+        response = self.client.get(self.url_create_list_question)
+        self.assertEqual(response.json()['count'], total)
+        self.assertTrue(response.json()['count_is_approximate'])
+
+        # The new question invalidates the cached list, not the cached count.
+        Question.objects.create(title='Pergunta nova', content='Conteúdo', profile=self.profile3)
+
+        response = self.client.get(self.url_create_list_question)
+        self.assertEqual(len(response.json()['results']), total + 1)
+        self.assertEqual(response.json()['count'], total)
+
+    @override_settings(PAGINATION_EXACT_COUNT_THRESHOLD=5)
+    def test_filtered_list_count_is_estimated_above_threshold(self):
+        Question.objects.bulk_create(
+            Question(title=f'Pergunta {index}', content='Conteúdo', profile=self.profile3)
+            for index in range(60)
+        )
+
+        response = self.client.get(self.url_create_list_question, {'is_solutioned': False})
+        self.assertTrue(response.json()['count_is_approximate'])
+        self.assertGreater(response.json()['count'], 5)
+
+        last_page = self.client.get(response.json()['next']).json()
+        self.assertLess(len(last_page['results']), 50)
+        self.assertIsNone(last_page['next'])
+
+    def test_small_list_count_is_exact(self):
+        response = self.client.get(self.url_create_list_question, {'is_solutioned': False})
+
+        self.assertEqual(response.json()['count'], len(response.json()['results']))
+        self.assertFalse(response.json()['count_is_approximate'])
@@ -4,8 +4,8 @@ from answers.views import AnswerListView
 
 
 urlpatterns = [
-    path('questions/', QuestionListCreateView.as_view(), name='create-question'),
-    path('questions/<int:pk>/', QuestionDetailUpdateView.as_view(), name='detail-question'),
+    path('questions/', QuestionListCreateView.as_async_view(), name='create-question'),
+    path('questions/<int:pk>/', QuestionDetailUpdateView.as_async_view(), name='detail-question'),
     path('questions/<int:pk>/like/', QuestionLikeToggleView.as_view(), name='like-question'),
-    path('questions/<int:question_pk>/answers/', AnswerListView.as_view(), name='answers-question'),
+    path('questions/<int:question_pk>/answers/', AnswerListView.as_async_view(), name='answers-question'),
 ]
@@ -1,30 +1,31 @@
-from django.conf import settings
+from django.db.models import Prefetch
 from django_filters.rest_framework import DjangoFilterBackend
-from django.core.cache import caches
 from rest_framework import generics, serializers, status
 from rest_framework.permissions import IsAuthenticated, AllowAny
 from rest_framework.response import Response
-from rest_framework.filters import OrderingFilter, SearchFilter
+from rest_framework.filters import OrderingFilter
 from drf_spectacular.utils import extend_schema
 from questions.models import Question
+from answers.models import Answer
 from questions.filters import QuestionFilter
+from questions.signals import likes_counter
 from app.exceptions import ObjectNotFound
+from app.async_views import AsyncReadMixin
+from app.cache import ViewCacheEntry, bump_namespace
+from app.pagination import KeysetPagination
+from app.search import FullTextSearchFilter
 from questions.serializers import QuestionModelSerializer, QuestionDetailModelSerializer, QuestionDeleteModelSerializer, QuestionListModelSerializer
 from profiles.models import UserProfile
 from profiles.permissions import IsOwner
 
 
-cache_view = caches['view_cache']
-
-
 @extend_schema(
     tags=['Question (Pergunta)']
 )
-class QuestionListCreateView(generics.ListCreateAPIView):
-    queryset = Question.objects.filter(is_published=True)
-    filter_backends = (DjangoFilterBackend, SearchFilter, OrderingFilter)
+class QuestionListCreateView(AsyncReadMixin, generics.ListCreateAPIView):
+    filter_backends = (DjangoFilterBackend, OrderingFilter, FullTextSearchFilter)
+    pagination_class = KeysetPagination
     filterset_class = QuestionFilter
-    search_fields = ['title', 'content']
     ordering = ['-created_at']
 
     def get_permissions(self):
@@ -33,6 +34,13 @@ class QuestionListCreateView(generics.ListCreateAPIView):
 
         return [AllowAny()]
 
+    def get_queryset(self):
+        return Question.objects.filter(is_published=True).select_related(
+            'profile__user'
+        ).prefetch_related(
+            'technologies'
+        )
+
     def get_object(self):
         obj = super().get_object()
 
@@ -54,24 +62,17 @@ class QuestionListCreateView(generics.ListCreateAPIView):
         if get_profile:
             serializer.save(profile=get_profile)
 
-        cache_view.delete("list_all_question_published")
+    def get_cache_entry(self, request, *args, **kwargs):
+        return ViewCacheEntry.for_list(self, request, "list_all_question_published")
 
     def list(self, request, *args, **kwargs):
-        key = "list_all_question_published"
-        cached_data = cache_view.get(key)
-        if cached_data:
-            return Response(cached_data, status=status.HTTP_200_OK)
-
-        response = super().list(request, *args, **kwargs)
-        cache_view.set(key, response.data, timeout=settings.CACHE_TTL)
-        return response
+        return self.get_cache_entry(request).get_or_build(super().list, request, *args, **kwargs)
 
 
 @extend_schema(
     tags=['Question (Pergunta)']
 )
-class QuestionDetailUpdateView(generics.RetrieveUpdateDestroyAPIView):
-    queryset = Question.objects.all()
+class QuestionDetailUpdateView(AsyncReadMixin, generics.RetrieveUpdateDestroyAPIView):
     http_method_names = ['get', 'patch', 'delete', 'options', 'head']
 
     def get_permissions(self):
@@ -80,6 +81,19 @@ class QuestionDetailUpdateView(generics.RetrieveUpdateDestroyAPIView):
 
         return [IsAuthenticated(), IsOwner()]
 
+    def get_queryset(self):
+        if self.request.method != 'GET':
+            return Question.objects.all()
+
+        answers = Answer.objects.select_related('author__user').order_by('created_at')
+
+        return Question.objects.select_related(
+            'profile__user'
+        ).prefetch_related(
+            'technologies',
+            Prefetch('answers', queryset=answers)
+        )
+
     def get_object(self):
         obj = super().get_object()
 
@@ -94,17 +108,12 @@ class QuestionDetailUpdateView(generics.RetrieveUpdateDestroyAPIView):
 
         return QuestionDetailModelSerializer
 
-    def retrieve(self, request, *args, **kwargs):
-        question = self.get_object()
-        key = f"question_detail_{question.pk}"
-
-        cached_data = cache_view.get(key)
-        if cached_data:
-            return Response(cached_data, status=status.HTTP_200_OK)
+    def get_cache_entry(self, request, *args, **kwargs):
+        pk = self.kwargs.get('pk')
+        return ViewCacheEntry(f"question_detail_{pk}", f"question_{pk}", local=True)
 
-        response = super().retrieve(request, *args, **kwargs)
-        cache_view.set(key, response.data, timeout=settings.CACHE_TTL)
-        return response
+    def retrieve(self, request, *args, **kwargs):
+        return self.get_cache_entry(request).get_or_build(super().retrieve, request, *args, **kwargs)
 
 
 @extend_schema(
@@ -116,16 +125,15 @@ class QuestionLikeToggleView(generics.GenericAPIView):
     permission_classes = [IsAuthenticated]
 
     def post(self, request, *args, **kwargs):
-        question = self.get_object()
-
-        try:
-            profile = request.user.profile
-        except UserProfile.DoesNotExist:
-            return ObjectNotFound()
+        pk = self.kwargs.get('pk')
+        profile_pk = UserProfile.objects.filter(user_id=request.user.id).values_list('pk', flat=True).first()
+        if profile_pk is None:
+            raise ObjectNotFound()
 
-        if profile in question.likes.all():
-            question.likes.remove(profile)
-        else:
-            question.likes.add(profile)
+        toggled = likes_counter.toggle(pk, profile_pk)
+        if toggled is None:
+            raise ObjectNotFound()
 
-        return Response({"likes_count": question.likes.count()}, status=status.HTTP_200_OK)
+        bump_namespace(f"question_{pk}")
+        _, likes_count = toggled
+        return Response({"likes_count": likes_count}, status=status.HTTP_200_OK)
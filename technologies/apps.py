@@ -4,3 +4,6 @@ from django.apps import AppConfig
 class TechnologiesConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'technologies'
+
+    def ready(self):
+        import technologies.signals
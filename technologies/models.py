@@ -6,8 +6,11 @@ class Technology(models.Model):
     slug = models.SlugField(max_length=50, unique=True)
     color = models.CharField(max_length=7, default="#5e6e7d", help_text="Cor do 'badge' (Hex). Sempre usado se não houver logo.")
     logo = models.ImageField(upload_to='tech_logos/', null=True, blank=True, help_text="Logo da tecnologia (opcional).")
+    logo_variants = models.JSONField(default=dict, blank=True, editable=False)
     prism_lang = models.CharField(max_length=50, blank=True)
 
+    LOGO_SIZES = {'small': 40, 'medium': 96}
+
     class Meta:
         unique_together = ('name', 'slug', 'logo')
 
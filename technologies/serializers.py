@@ -1,8 +1,10 @@
 from rest_framework import serializers
 from technologies.models import Technology
+from app.images import ImageVariantsField
 
 
 class TechnologyModelSerializer(serializers.ModelSerializer):
+    logo_variants = ImageVariantsField('logo')
 
     class Meta:
         model = Technology
@@ -10,6 +12,7 @@ class TechnologyModelSerializer(serializers.ModelSerializer):
 
 
 class TechnologyDetailUpdateDeleteModelSerializer(serializers.ModelSerializer):
+    logo_variants = ImageVariantsField('logo')
 
     class Meta:
         model = Technology
@@ -17,7 +20,8 @@ class TechnologyDetailUpdateDeleteModelSerializer(serializers.ModelSerializer):
 
 
 class TechnologyDetailSerializer(serializers.ModelSerializer):
+    logo_variants = ImageVariantsField('logo')
 
     class Meta:
         model = Technology
-        fields = ['name', 'logo']
+        fields = ['name', 'logo', 'logo_variants']
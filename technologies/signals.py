@@ -0,0 +1,11 @@
+from django.dispatch import receiver
+from django.db.models.signals import post_save
+from technologies.models import Technology
+from technologies.tasks import build_logo_variants
+from app import images
+
+
+@receiver(post_save, sender=Technology)
+def process_logo(sender, instance, **kwargs):
+    if images.needs_variants(instance.logo, instance.logo_variants):
+        build_logo_variants.delay(instance.pk)
@@ -0,0 +1,26 @@
+from app import images
+from app.cache import bump_namespace
+from app.tasks import task
+from technologies.models import Technology
+
+
+@task
+def build_logo_variants(technology_id: int):
+    technology = Technology.objects.filter(pk=technology_id).first()
+    if technology is None or not images.needs_variants(technology.logo, technology.logo_variants):
+        return
+
+    variants = images.build_variants(technology.logo, Technology.LOGO_SIZES)
+
+    updated = Technology.objects.filter(pk=technology_id, logo=technology.logo.name).update(
+        logo_variants=variants
+    )
+    if updated:
+        # Logos are embedded in the cached question and article responses.
+        question_pks = technology.question_tags.values_list('pk', flat=True)
+        article_pks = technology.article_tags.values_list('pk', flat=True)
+        bump_namespace(
+            'list_all_question_published', 'list_article',
+            *[f"question_{pk}" for pk in question_pks],
+            *[f"article_{pk}" for pk in article_pks],
+        )
@@ -1,6 +1,12 @@
+import shutil
+import tempfile
+from io import BytesIO
+from PIL import Image
 from django.urls import reverse
 from django.contrib.auth.models import User
 from django.core.cache import caches
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test.utils import override_settings
 from rest_framework import status
 from rest_framework.test import APITestCase
 from technologies.models import Technology
@@ -135,3 +141,27 @@ class TechnologyAPITestCase(APITestCase):
 
         self.assertEqual(response.status_code, status.HTTP_204_NO_CONTENT)
         self.assertFalse(Technology.objects.filter(pk=self.technology.pk).exists())
+
+    def test_uploaded_logo_gets_webp_variants_keeping_aspect_ratio(self):
+        media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media_root)
+
+        buffer = BytesIO()
+        Image.new('RGBA', (400, 200), (255, 0, 0, 128)).save(buffer, 'PNG')
+        logo = SimpleUploadedFile('rust.png', buffer.getvalue(), content_type='image/png')
+
+        self.client.force_authenticate(user=self.admin_user)
+        with override_settings(MEDIA_ROOT=media_root):
+            response = self.client.post(
+                self.url_create, {"name": "Rust", "slug": "rust", "logo": logo}, format='multipart'
+            )
+
+            technology = Technology.objects.get(slug='rust')
+            sizes = {}
+            for name, path in technology.logo_variants.items():
+                if name != 'source':
+                    with technology.logo.storage.open(path) as file, Image.open(file) as image:
+                        sizes[name] = (image.format, image.mode, image.size)
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(sizes, {'small': ('WEBP', 'RGBA', (40, 20)), 'medium': ('WEBP', 'RGBA', (96, 48))})
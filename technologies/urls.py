@@ -4,5 +4,5 @@ from technologies.views import TechnologyCreateView, TechnologyRetrieveUpdateDes
 
 urlpatterns = [
     path('tags/', TechnologyCreateView.as_view(), name='technology-create'),
-    path('tags/<int:pk>/', TechnologyRetrieveUpdateDestroyView.as_view(), name='technology-detail'),
+    path('tags/<int:pk>/', TechnologyRetrieveUpdateDestroyView.as_async_view(), name='technology-detail'),
 ]
@@ -1,6 +1,8 @@
 from rest_framework import generics
 from rest_framework.permissions import IsAdminUser, IsAuthenticated
+from rest_framework.response import Response
 from drf_spectacular.utils import extend_schema
+from app.async_views import AsyncReadMixin
 from technologies.models import Technology
 from technologies.serializers import TechnologyModelSerializer, TechnologyDetailUpdateDeleteModelSerializer
 
@@ -17,7 +19,7 @@ class TechnologyCreateView(generics.CreateAPIView):
 @extend_schema(
     tags=['Technology (Tecnologia)']
 )
-class TechnologyRetrieveUpdateDestroyView(generics.RetrieveUpdateDestroyAPIView):
+class TechnologyRetrieveUpdateDestroyView(AsyncReadMixin, generics.RetrieveUpdateDestroyAPIView):
     queryset = Technology.objects.all()
     serializer_class = TechnologyDetailUpdateDeleteModelSerializer
     http_method_names = ['get', 'put', 'delete', 'options', 'head']
@@ -27,3 +29,12 @@ class TechnologyRetrieveUpdateDestroyView(generics.RetrieveUpdateDestroyAPIView)
             return [IsAuthenticated()]
 
         return [IsAuthenticated(), IsAdminUser()]
+
+    async def async_get(self, request, *args, **kwargs):
+        # Not cached: a single-row lookup with the async ORM. Missing rows
+        # fall back to the sync view for its 404 response.
+        technology = await self.get_queryset().filter(pk=self.kwargs.get('pk')).afirst()
+        if technology is None:
+            return None
+
+        return Response(self.get_serializer(technology).data)